@@ -26,6 +26,11 @@ from ..utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+def _now_iso() -> str:
+    """Timestamp for emitted events (events always carry ISO strings, never datetimes)."""
+    return datetime.now().isoformat()
+
+
 class NegotiationGraph:
     """Negotiation graph orchestrator."""
     
@@ -68,11 +73,16 @@ class NegotiationGraph:
         logger.info(f"Max rounds: {self.max_rounds}, Current round: {room_state.current_round}")
         logger.info(f"Number of sellers: {len(room_state.sellers)}")
         
+        # Room-invariant lookups, hoisted out of the round loop
+        buyer_id = room_state.buyer_id
+        buyer_name = room_state.buyer_name
+        seller_names = {s.seller_id: s.name for s in room_state.sellers}
+        
         # Emit connected event
         yield {
             "type": "heartbeat",
             "data": {"message": "Negotiation started", "round": room_state.current_round},
-            "timestamp": datetime.now()
+            "timestamp": _now_iso()
         }
         
         try:
@@ -87,7 +97,7 @@ class NegotiationGraph:
                         "round_number": room_state.current_round,
                         "max_rounds": self.max_rounds
                     },
-                    "timestamp": datetime.now()
+                    "timestamp": _now_iso()
                 }
                 
                 # Node 1: Buyer Turn
@@ -98,14 +108,14 @@ class NegotiationGraph:
                 yield {
                     "type": "buyer_message",
                     "data": {
-                        "sender_id": room_state.buyer_id,
-                        "sender_name": room_state.buyer_name,
+                        "sender_id": buyer_id,
+                        "sender_name": buyer_name,
                         "sender_type": "buyer",
                         "message": buyer_result["message"],
                         "mentioned_sellers": buyer_result["mentioned_sellers"],
                         "round": room_state.current_round
                     },
-                    "timestamp": datetime.now()
+                    "timestamp": _now_iso()
                 }
                 
                 # Node 2: Message Routing (determine which sellers respond)
@@ -127,11 +137,7 @@ class NegotiationGraph:
                 # Emit seller responses
                 for seller_id, result in seller_results.items():
                     if result:
-                        # Find seller name
-                        seller_name = next(
-                            (s.name for s in room_state.sellers if s.seller_id == seller_id),
-                            "Unknown Seller"
-                        )
+                        seller_name = seller_names.get(seller_id, "Unknown Seller")
                         
                         yield {
                             "type": "seller_response",
@@ -143,7 +149,7 @@ class NegotiationGraph:
                                 "offer": result.get("offer"),
                                 "round": room_state.current_round
                             },
-                            "timestamp": datetime.now()
+                            "timestamp": _now_iso()
                         }
                 
                 # Node 4: Decision Check (async - buyer agent decides)
@@ -155,11 +161,7 @@ class NegotiationGraph:
                     room_state.final_offer = decision["offer"]
                     room_state.decision_reason = decision.get("reason", "Best offer selected")
                     
-                    # Find seller name
-                    selected_seller_name = next(
-                        (s.name for s in room_state.sellers if s.seller_id == decision["seller_id"]),
-                        "Unknown Seller"
-                    )
+                    selected_seller_name = seller_names.get(decision["seller_id"], "Unknown Seller")
                     
                     # Emit decision event first
                     yield {
@@ -173,7 +175,7 @@ class NegotiationGraph:
                             "total_cost": decision["offer"]["price"] * decision["offer"]["quantity"],
                             "reason": decision.get("reason", "Best offer selected")
                         },
-                        "timestamp": datetime.now()
+                        "timestamp": _now_iso()
                     }
                     
                     # Then emit completion
@@ -186,7 +188,7 @@ class NegotiationGraph:
                             "reason": decision.get("reason"),
                             "rounds": room_state.current_round
                         },
-                        "timestamp": datetime.now()
+                        "timestamp": _now_iso()
                     }
                     break
                 
@@ -194,7 +196,7 @@ class NegotiationGraph:
                 yield {
                     "type": "heartbeat",
                     "data": {"message": f"Round {room_state.current_round} complete", "round": room_state.current_round},
-                    "timestamp": datetime.now()
+                    "timestamp": _now_iso()
                 }
             
             # Max rounds reached
@@ -208,7 +210,7 @@ class NegotiationGraph:
                         "reason": "Max rounds reached",
                         "rounds": room_state.current_round
                     },
-                    "timestamp": datetime.now()
+                    "timestamp": _now_iso()
                 }
         
         except Exception as e:
@@ -217,7 +219,7 @@ class NegotiationGraph:
             yield {
                 "type": "error",
                 "data": {"error": str(e), "round": room_state.current_round},
-                "timestamp": datetime.now()
+                "timestamp": _now_iso()
             }
     
     async def _buyer_turn_node(
@@ -414,7 +416,7 @@ class NegotiationGraph:
         # Map responses to seller IDs
         for seller, response in zip(sellers, responses):
             if isinstance(response, Exception):
-                logger.error(f"Seller {seller.name} (ID: {seller.seller_id}) raised exception: {response}", exc_info=True)
+                logger.error(f"Seller {seller.name} (ID: {seller.seller_id}) raised exception: {response}")
                 results[seller.seller_id] = None
             elif response is None:
                 logger.warning(f"Seller {seller.name} (ID: {seller.seller_id}) returned None response")
@@ -8,10 +8,12 @@ HOW: Read JSON files from logs directory
 
 from fastapi import APIRouter, HTTPException, status
 from fastapi.responses import FileResponse, JSONResponse
+from starlette.concurrency import run_in_threadpool
 from pathlib import Path
 import json
 
 from ....core.config import settings
+from ....core.session_manager import session_manager
 from ....utils.exceptions import SessionNotFoundError, RoomNotFoundError
 from ....utils.logger import get_logger
 
@@ -19,6 +21,9 @@ logger = get_logger(__name__)
 
 router = APIRouter()
 
+# Seconds to wait for a queued log write before falling back to a 404
+LOG_WRITE_TIMEOUT = 5.0
+
 
 @router.get("/logs/{session_id}/{room_id}")
 async def get_negotiation_log(session_id: str, room_id: str):
@@ -41,8 +46,17 @@ async def get_negotiation_log(session_id: str, room_id: str):
     """
     logger.info(f"Retrieving log for session {session_id}, room {room_id}")
     
+    # finalize_run hands the log to a background writer, so a request made
+    # right after completion waits for that run's write instead of a 404
+    if session_manager.log_write_pending(session_id, room_id):
+        written = await run_in_threadpool(
+            session_manager.wait_for_log, session_id, room_id, LOG_WRITE_TIMEOUT
+        )
+        if not written:
+            logger.warning(f"Log for room {room_id} still being written after {LOG_WRITE_TIMEOUT}s")
+    
     # Construct log file path
-    log_path = Path(settings.LOGS_DIR) / session_id / room_id / f"{room_id}.json"
+    log_path = session_manager.log_path(session_id, room_id)
     
     if not log_path.exists():
         # Try alternate path (without extra room_id subdir)
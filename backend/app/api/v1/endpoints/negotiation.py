@@ -7,14 +7,15 @@ HOW: FastAPI endpoints wrapping SessionManager and NegotiationGraph
 """
 
 from fastapi import APIRouter, HTTPException, status
+from starlette.concurrency import run_in_threadpool
 from typing import Dict, Optional, List
 from datetime import datetime
-import json
+from sqlalchemy.orm import joinedload, selectinload
 
 from ....core.session_manager import session_manager, active_rooms
 from ....core.database import get_db
 from ....core.models import (
-    NegotiationRun, Message, Offer, Buyer, BuyerItem, Seller
+    NegotiationRun, Message, Offer, BuyerItem, Seller, is_guid
 )
 from ....models.api_schemas import (
     SendMessageRequest,
@@ -56,7 +57,7 @@ async def start_negotiation(room_id: str) -> Dict:
         NegotiationAlreadyActiveError: If already active
     """
     logger.info(f"POST /negotiation/{room_id}/start - Starting negotiation")
-    logger.info(f"Current active_rooms: {list(active_rooms.keys())}")
+    logger.info(f"Current active_rooms: {len(active_rooms)} rooms")
     
     # Check if already active
     if room_id in active_rooms:
@@ -67,7 +68,7 @@ async def start_negotiation(room_id: str) -> Dict:
         )
     
     logger.info(f"Calling session_manager.start_negotiation for {room_id}")
-    result = session_manager.start_negotiation(room_id)
+    result = await run_in_threadpool(session_manager.start_negotiation, room_id)
     logger.info(f"start_negotiation returned: {result}")
     
     if "error" in result:
@@ -117,7 +118,13 @@ async def send_message(room_id: str, request: SendMessageRequest) -> SendMessage
     logger.info(f"Sending manual message to room {room_id}")
     
     with get_db() as db:
-        run = db.query(NegotiationRun).filter(NegotiationRun.id == room_id).first()
+        # Buyer item and buyer ride along in the same SELECT as the run
+        run = (
+            db.query(NegotiationRun)
+            .options(joinedload(NegotiationRun.buyer_item).joinedload(BuyerItem.buyer))
+            .filter(NegotiationRun.id == room_id)
+            .first()
+        ) if is_guid(room_id) else None
         if not run:
             raise RoomNotFoundError(
                 message=f"Room {room_id} not found",
@@ -125,17 +132,14 @@ async def send_message(room_id: str, request: SendMessageRequest) -> SendMessage
             )
         
         # Get room state to parse mentions
-        room_state = None
-        if room_id in active_rooms:
-            room_state, _ = active_rooms[room_id]
+        room_state = session_manager.get_active_room_state(room_id)
         
         mentioned_sellers = []
         if room_state:
             mentioned_sellers = parse_mentions(request.message, room_state.sellers)
         
         # Record message
-        buyer_item = db.query(BuyerItem).filter(BuyerItem.id == run.buyer_item_id).first()
-        buyer = db.query(Buyer).filter(Buyer.id == buyer_item.buyer_id).first() if buyer_item else None
+        buyer = run.buyer_item.buyer if run.buyer_item else None
         
         message = session_manager.record_message(
             run_id=room_id,
@@ -201,7 +205,7 @@ async def force_decision(
     
     with get_db() as db:
         # Check if run exists
-        run = db.query(NegotiationRun).filter(NegotiationRun.id == room_id).first()
+        run = db.query(NegotiationRun).filter(NegotiationRun.id == room_id).first() if is_guid(room_id) else None
         if not run:
             raise RoomNotFoundError(
                 message=f"Room {room_id} not found",
@@ -235,7 +239,7 @@ async def force_decision(
             participant = db.query(NegotiationParticipant).filter(
                 NegotiationParticipant.negotiation_run_id == room_id,
                 NegotiationParticipant.seller_id == selected_seller_id
-            ).first()
+            ).first() if is_guid(selected_seller_id) else None
             
             if not participant:
                 raise ValidationError(
@@ -275,7 +279,9 @@ async def force_decision(
                     )
     
     try:
-        outcome = session_manager.finalize_run(
+        # finalize_run commits and writes the JSON log; keep that disk I/O off the event loop
+        outcome = await run_in_threadpool(
+            session_manager.finalize_run,
             run_id=room_id,
             decision_type=decision_type,
             selected_seller_id=selected_seller_id,
@@ -328,7 +334,7 @@ async def get_negotiation_state(
     logger.info(f"Getting state for room {room_id}")
     
     with get_db() as db:
-        run = db.query(NegotiationRun).filter(NegotiationRun.id == room_id).first()
+        run = db.query(NegotiationRun).filter(NegotiationRun.id == room_id).first() if is_guid(room_id) else None
         if not run:
             raise RoomNotFoundError(
                 message=f"Room {room_id} not found",
@@ -338,8 +344,8 @@ async def get_negotiation_state(
         # Get buyer item
         buyer_item = db.query(BuyerItem).filter(BuyerItem.id == run.buyer_item_id).first()
         
-        # Get conversation history
-        messages = db.query(Message).filter(
+        # Get conversation history, with every message's mentions in one extra query
+        messages = db.query(Message).options(selectinload(Message.mentions)).filter(
             Message.negotiation_run_id == room_id
         ).order_by(Message.turn_number).all()
         
@@ -352,7 +358,7 @@ async def get_negotiation_state(
                 "sender_id": msg.sender_id,
                 "sender_name": msg.sender_name,
                 "content": msg.message_text,
-                "mentioned_agents": json.loads(msg.mentioned_agents) if msg.mentioned_agents else []
+                "mentioned_agents": msg.mentioned_agents
             }
             for msg in messages
         ]
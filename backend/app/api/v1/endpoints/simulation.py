@@ -7,6 +7,7 @@ HOW: FastAPI endpoints wrapping SessionManager and summary services
 """
 
 from fastapi import APIRouter, HTTPException, status
+from starlette.concurrency import run_in_threadpool
 from typing import Dict
 import asyncio
 
@@ -67,7 +68,7 @@ async def initialize_session(request: InitializeSessionRequest):
     logger.info(f"Full llm_config: {request.llm_config.model_dump()}")
     
     try:
-        response = session_manager.create_session(request)
+        response = await run_in_threadpool(session_manager.create_session, request)
         logger.info(f"Created session {response.session_id} with {response.total_rooms} rooms")
         return response
     except Exception as e:
@@ -98,7 +99,7 @@ async def get_session(session_id: str) -> Dict:
     """
     logger.info(f"Getting session {session_id}")
     
-    session = session_manager.get_session(session_id)
+    session = await run_in_threadpool(session_manager.get_session, session_id)
     if not session:
         raise SessionNotFoundError(
             message=f"Session {session_id} not found",
@@ -128,7 +129,7 @@ async def delete_session(session_id: str) -> Dict:
     """
     logger.info(f"Deleting session {session_id}")
     
-    result = session_manager.delete_session(session_id)
+    result = await run_in_threadpool(session_manager.delete_session, session_id)
     if not result.get("deleted"):
         raise SessionNotFoundError(
             message=f"Session {session_id} not found",
@@ -164,8 +165,8 @@ async def get_session_summary(session_id: str) -> SessionSummaryResponse:
     
     with get_db() as db:
         # Check session exists
-        from ....core.models import Session as SessionModel, Buyer, NegotiationRun, NegotiationOutcome, BuyerItem
-        session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
+        from ....core.models import Session as SessionModel, Buyer, NegotiationRun, NegotiationOutcome, BuyerItem, is_guid
+        session = db.query(SessionModel).filter(SessionModel.id == session_id).first() if is_guid(session_id) else None
         if not session:
             raise SessionNotFoundError(
                 message=f"Session {session_id} not found",
@@ -8,12 +8,12 @@ HOW: EventSourceResponse wrapping NegotiationGraph event stream
 
 from fastapi import APIRouter
 from sse_starlette.sse import EventSourceResponse
-from typing import AsyncIterator
-import asyncio
+from starlette.concurrency import run_in_threadpool
+from typing import AsyncIterator, List, Optional
 import json
 from datetime import datetime
 
-from ....core.session_manager import active_rooms, session_manager
+from ....core.session_manager import active_rooms, session_manager, OutcomePayload
 from ....core.config import settings
 from ....core.database import get_db
 from ....core.models import NegotiationRun
@@ -26,180 +26,209 @@ logger = get_logger(__name__)
 
 router = APIRouter()
 
+# Response headers that keep proxies (nginx, CDNs) from buffering, compressing,
+# or idling out the stream
+_SSE_HEADERS = {
+    "Cache-Control": "no-cache, no-transform",
+    "Pragma": "no-cache",
+    "Connection": "keep-alive",
+    "Keep-Alive": "timeout=120",
+    "X-Accel-Buffering": "no",
+    "Content-Encoding": "identity",
+}
 
-async def negotiation_event_generator(room_id: str) -> AsyncIterator[dict]:
+def _frame(event_name: str, payload: dict) -> bytes:
+    """
+    Encode one SSE frame.
+    
+    EventSourceResponse passes bytes through untouched, so building the
+    wire format here skips its per-event ServerSentEvent formatting pass.
+    """
+    return b"event: " + event_name.encode() + b"\ndata: " + json.dumps(payload).encode() + b"\n\n"
+
+
+def _outcome_from_decision(decision_data: dict) -> Optional[OutcomePayload]:
+    """Convert a captured decision event payload into an OutcomePayload."""
+    decision = decision_data.get("decision")
+    if decision == "accept":
+        return OutcomePayload(
+            decision_type="deal",
+            selected_seller_id=decision_data.get("chosen_seller_id"),
+            final_price_per_unit=decision_data.get("final_price"),
+            quantity=decision_data.get("final_quantity"),
+            decision_reason=decision_data.get("reason", "Negotiation completed successfully")
+        )
+    if decision == "reject":
+        return OutcomePayload(
+            decision_type="no_deal",
+            decision_reason=decision_data.get("reason", "No suitable offers")
+        )
+    return None
+
+
+def _persist_outcome(
+    room_id: str,
+    current_round: int,
+    outcome: Optional[OutcomePayload],
+    messages: List[dict]
+) -> None:
+    """
+    Persist the outcome of a finished stream (blocking DB work).
+    
+    Awaited in the threadpool before negotiation_complete is sent. Failures
+    are logged, never raised, so a failing DB cannot break the stream.
+    
+    Args:
+        room_id: Negotiation run ID
+        current_round: Round the graph stopped at
+        outcome: Outcome captured from the decision event, if any
+        messages: The room's conversation history, saved with the outcome
+    """
+    try:
+        if outcome is None:
+            # No decision captured (max rounds or other completion) - mark as no_deal
+            logger.info(f"Negotiation ended without explicit decision for room {room_id}, marking as no_deal")
+            with get_db() as db:
+                run = db.query(NegotiationRun).filter(NegotiationRun.id == room_id).first()
+                if run:
+                    run.status = "completed"
+                    run.current_round = current_round
+                    run.ended_at = datetime.now()
+                    db.commit()
+            
+            outcome = OutcomePayload(
+                decision_type="no_deal",
+                decision_reason="Negotiation ended without reaching agreement"
+            )
+        else:
+            logger.info(f"Saving {outcome.decision_type} outcome for room {room_id}")
+        
+        session_manager.finalize_run(
+            run_id=room_id,
+            decision_type=outcome.decision_type,
+            selected_seller_id=outcome.selected_seller_id,
+            final_price_per_unit=outcome.final_price_per_unit,
+            quantity=outcome.quantity,
+            decision_reason=outcome.decision_reason,
+            emit_event=False,  # Events already emitted during streaming
+            messages=messages
+        )
+    except Exception as e:
+        # Recoverable (e.g. the run was already finalized); no traceback needed
+        logger.warning("Failed to persist outcome for room %s: %s", room_id, e)
+
+
+async def negotiation_event_generator(room_id: str) -> AsyncIterator[bytes]:
     """
     Generate SSE events for negotiation.
     
-    WHAT: Stream negotiation events with heartbeats
+    WHAT: Stream negotiation events
     WHY: Real-time updates to frontend
-    HOW: Yield events from NegotiationGraph with periodic heartbeats
+    HOW: Yield events from NegotiationGraph (keep-alive pings come from EventSourceResponse)
     
     Args:
         room_id: Negotiation run ID
         
     Yields:
-        SSE event dicts
+        Encoded SSE frames
     """
     logger.info(f"Starting SSE stream for room {room_id}")
     
-    # Check if room exists and is active
-    if room_id not in active_rooms:
+    # Single lookup; the local reference keeps room_state alive even if the
+    # cache entry is popped by another path mid-stream
+    entry = active_rooms.get(room_id)
+    if entry is None:
         logger.error(f"Room {room_id} not found in active_rooms")
-        yield {
-            "event": "error",
-            "data": json.dumps({
-                "type": "error",
-                "error": "ROOM_NOT_FOUND",
-                "message": f"Room {room_id} not found or not active",
-                "timestamp": datetime.now().isoformat()
-            })
-        }
+        yield _frame("error", {
+            "type": "error",
+            "error": "ROOM_NOT_FOUND",
+            "message": f"Room {room_id} not found or not active",
+            "timestamp": datetime.now().isoformat()
+        })
         return
     
     # Send connected event immediately
-    yield {
-        "event": "connected",
-        "data": json.dumps({
-            "type": "connected",
-            "room_id": room_id,
-            "timestamp": datetime.now().isoformat()
-        })
-    }
+    yield _frame("connected", {
+        "type": "connected",
+        "room_id": room_id,
+        "timestamp": datetime.now().isoformat()
+    })
+    
+    room_state, _ = entry
     
     try:
-        # Get room state
-        room_state, _ = active_rooms[room_id]
-        
         # Get LLM provider from room state (session-specific)
         provider = get_provider(room_state.llm_provider)
         
         # Create negotiation graph
         graph = NegotiationGraph(provider)
         
-        # Create heartbeat task
-        heartbeat_task = None
-        stop_heartbeat = asyncio.Event()
-        
-        async def send_heartbeats():
-            """Send periodic heartbeat events."""
-            while not stop_heartbeat.is_set():
-                try:
-                    await asyncio.sleep(settings.SSE_HEARTBEAT_INTERVAL)
-                    if not stop_heartbeat.is_set():
-                        yield {
-                            "event": "heartbeat",
-                            "data": json.dumps({
-                                "type": "heartbeat",
-                                "timestamp": datetime.now().isoformat()
-                            })
-                        }
-                except asyncio.CancelledError:
-                    break
-        
-        # Track decision data for saving to DB
-        decision_data = None
+        # Track the decision outcome for saving to DB
+        outcome = None
+        # The graph's own completion frame, held back until the outcome is saved
+        complete_frame = None
         
         # Stream negotiation events
         async for event in graph.run(room_state):
-            # Serialize event data
-            event_data = event.get("data", {})
+            event_type = event["type"]
+            
+            # Graph events carry a fresh data dict, so annotate it in place
+            # rather than copying it
+            event_data = event.get("data")
+            if event_data is None:
+                event_data = {}
             
             # Add type field to data payload for frontend categorization
-            event_data["type"] = event["type"]
+            event_data["type"] = event_type
             
-            # Ensure timestamp exists for all events
+            # Graph events carry an ISO timestamp already; payloads may override it
             if "timestamp" not in event_data:
-                event_data["timestamp"] = datetime.now().isoformat()
-            elif isinstance(event_data["timestamp"], datetime):
-                # Convert datetime objects to ISO strings
-                event_data["timestamp"] = event_data["timestamp"].isoformat()
-            
-            # Capture decision data when decision event is emitted
-            if event["type"] == "decision":
-                decision_data = event_data
-                logger.info(f"Captured decision data for room {room_id}: {decision_data.get('decision')}")
+                event_data["timestamp"] = event.get("timestamp") or datetime.now().isoformat()
             
-            yield {
-                "event": event["type"],
-                "data": json.dumps(event_data)
-            }
+            if event_type == "decision":
+                # Capture the outcome when decision event is emitted
+                outcome = _outcome_from_decision(event_data)
+                logger.info(f"Captured decision for room {room_id}: {event_data.get('decision')}")
             
             # Check if negotiation is complete
-            if event["type"] == "negotiation_complete":
+            if event_type == "negotiation_complete":
                 logger.info(f"Negotiation {room_id} completed")
+                complete_frame = _frame(event_type, event_data)
                 break
+            
+            yield _frame(event_type, event_data)
+        
+        # Commit the outcome and conversation before announcing completion, so a
+        # client that fetches the run or its summary on negotiation_complete sees
+        # it finalized
+        await run_in_threadpool(
+            _persist_outcome, room_id, room_state.current_round, outcome,
+            room_state.conversation_history
+        )
+        
+        if complete_frame is not None:
+            yield complete_frame
         
         # Send final completion event if not already sent
-        yield {
-            "event": "negotiation_complete",
-            "data": json.dumps({
-                "type": "negotiation_complete",
-                "room_id": room_id,
-                "timestamp": datetime.now().isoformat()
-            })
-        }
-
-        # Persist completion to DB - create outcome record
-        try:
-            if decision_data and decision_data.get("decision") == "accept":
-                # Buyer accepted an offer - save as deal
-                logger.info(f"Saving deal outcome for room {room_id}")
-                session_manager.finalize_run(
-                    run_id=room_id,
-                    decision_type="deal",
-                    selected_seller_id=decision_data.get("chosen_seller_id"),
-                    final_price_per_unit=decision_data.get("final_price"),
-                    quantity=decision_data.get("final_quantity"),
-                    decision_reason=decision_data.get("reason", "Negotiation completed successfully"),
-                    emit_event=False  # Events already emitted during streaming
-                )
-            elif decision_data and decision_data.get("decision") == "reject":
-                # Buyer rejected all offers
-                logger.info(f"Saving no_deal outcome for room {room_id}")
-                session_manager.finalize_run(
-                    run_id=room_id,
-                    decision_type="no_deal",
-                    decision_reason=decision_data.get("reason", "No suitable offers"),
-                    emit_event=False
-                )
-            else:
-                # No decision captured (max rounds or other completion) - mark as no_deal
-                logger.info(f"Negotiation ended without explicit decision for room {room_id}, marking as no_deal")
-                with get_db() as db:
-                    run = db.query(NegotiationRun).filter(NegotiationRun.id == room_id).first()
-                    if run:
-                        run.status = "completed"
-                        run.current_round = getattr(room_state, "current_round", run.current_round)
-                        run.ended_at = datetime.now()
-                        db.commit()
-                
-                session_manager.finalize_run(
-                    run_id=room_id,
-                    decision_type="no_deal",
-                    decision_reason="Negotiation ended without reaching agreement",
-                    emit_event=False
-                )
-        except Exception as e:
-            logger.error(f"Failed to persist outcome for room {room_id}: {e}")
+        yield _frame("negotiation_complete", {
+            "type": "negotiation_complete",
+            "room_id": room_id,
+            "timestamp": datetime.now().isoformat()
+        })
         
     except Exception as e:
         logger.error(f"Error in SSE stream for room {room_id}: {e}")
-        yield {
-            "event": "error",
-            "data": json.dumps({
-                "type": "error",
-                "error": "STREAM_ERROR",
-                "message": str(e),
-                "timestamp": datetime.now().isoformat()
-            })
-        }
+        yield _frame("error", {
+            "type": "error",
+            "error": "STREAM_ERROR",
+            "message": str(e),
+            "timestamp": datetime.now().isoformat()
+        })
     finally:
         logger.info(f"SSE stream ended for room {room_id}")
         # Cleanup in-memory state to allow clean restarts
         try:
-            if room_id in active_rooms:
-                del active_rooms[room_id]
+            if active_rooms.pop(room_id, None) is not None:
                 logger.info(f"Removed room {room_id} from active_rooms")
         except Exception as e:
             logger.error(f"Failed to cleanup active room {room_id}: {e}")
@@ -234,6 +263,8 @@ async def stream_negotiation(room_id: str):
     
     return EventSourceResponse(
         negotiation_event_generator(room_id),
-        media_type="text/event-stream"
+        media_type="text/event-stream",
+        headers=_SSE_HEADERS,
+        ping=settings.SSE_HEARTBEAT_INTERVAL
     )
 
@@ -3,43 +3,27 @@ API v1 router aggregation.
 
 WHAT: Combine all v1 endpoint routers
 WHY: Single place to register all API routes
-HOW: Include routers from endpoints with prefixes
+HOW: Include endpoint routers into one v1 router, mounted once under /api/v1
 """
 
 from fastapi import APIRouter
 
 from .endpoints import status, simulation, negotiation, streaming, logs
 
-# Create main v1 router
-api_router = APIRouter()
-
-# Include endpoint routers
-api_router.include_router(
-    status.router,
-    prefix="/api/v1",
-    tags=["status"]
+# Endpoint routers and their OpenAPI tags
+_ENDPOINT_ROUTERS = (
+    (status, "status"),
+    (simulation, "simulation"),
+    (negotiation, "negotiation"),
+    (streaming, "streaming"),
+    (logs, "logs"),
 )
 
-api_router.include_router(
-    simulation.router,
-    prefix="/api/v1",
-    tags=["simulation"]
-)
-
-api_router.include_router(
-    negotiation.router,
-    prefix="/api/v1",
-    tags=["negotiation"]
-)
+# Collect endpoint routers without a prefix
+v1_router = APIRouter()
+for module, tag in _ENDPOINT_ROUTERS:
+    v1_router.include_router(module.router, tags=[tag])
 
-api_router.include_router(
-    streaming.router,
-    prefix="/api/v1",
-    tags=["streaming"]
-)
-
-api_router.include_router(
-    logs.router,
-    prefix="/api/v1",
-    tags=["logs"]
-)
+# Create main v1 router and apply the version prefix once
+api_router = APIRouter()
+api_router.include_router(v1_router, prefix="/api/v1")
@@ -6,15 +6,38 @@ WHY: Type-safe, validated config with sensible defaults
 HOW: Pydantic BaseSettings reads from .env and environment
 """
 
-from pydantic_settings import BaseSettings
-from pydantic import field_validator
-from typing import Literal
+from functools import cached_property, lru_cache
+from pydantic_settings import BaseSettings, NoDecode, PydanticBaseSettingsSource, SettingsConfigDict
+from pydantic import BeforeValidator
+from typing import Annotated, Literal
 from pathlib import Path
+import os
+
+# Candidate .env files, resolved once at import
+_ROOT_ENV = str(Path(__file__).resolve().parents[3] / ".env")  # Hack_NYU/.env
+_BACKEND_ENV = str(Path(__file__).resolve().parents[2] / ".env")  # backend/.env (fallback)
+_ENV_FILES = tuple(path for path in (_ROOT_ENV, _BACKEND_ENV) if os.path.isfile(path))
+
+
+def _split_csv(value):
+    """Split a comma-separated string into its items; pass sequences through."""
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return value
 
 
 class Settings(BaseSettings):
     """Application settings loaded from environment."""
     
+    model_config = SettingsConfigDict(
+        # Look for .env in project root (Hack_NYU/.env) first, then backend/.env
+        env_file=_ENV_FILES,
+        env_file_encoding="utf-8",
+        case_sensitive=True,
+        # Settings are a read-only singleton; build a new instance to override
+        frozen=True,
+    )
+    
     # App metadata
     APP_NAME: str = "Multi-Agent Marketplace"
     APP_VERSION: str = "0.1.0"
@@ -48,24 +71,13 @@ class Settings(BaseSettings):
     MIN_NEGOTIATION_ROUNDS: int = 2  # Minimum rounds before buyer can decide
     PARALLEL_SELLER_LIMIT: int = 3  # Max concurrent seller responses
     
-    # CORS - accepts comma-separated string or list
-    # Use str type and parse in validator to avoid JSON parsing issues
-    CORS_ORIGINS: str = "http://localhost:3000,http://localhost:3001"
-    
-    @field_validator("CORS_ORIGINS", mode="before")
-    @classmethod
-    def parse_cors_origins(cls, v):
-        """Parse CORS_ORIGINS from comma-separated string or list."""
-        if isinstance(v, list):
-            return ",".join(v)
-        if isinstance(v, str):
-            # Return as-is (will be split when used)
-            return v
-        return v
-    
-    def get_cors_origins_list(self) -> list[str]:
-        """Get CORS origins as a list."""
-        return [origin.strip() for origin in self.CORS_ORIGINS.split(",") if origin.strip()]
+    # CORS - accepts comma-separated string or list; split once at construction
+    # into an immutable tuple (NoDecode stops pydantic-settings from
+    # JSON-decoding the raw env value)
+    CORS_ORIGINS: Annotated[tuple[str, ...], NoDecode, BeforeValidator(_split_csv)] = (
+        "http://localhost:3000",
+        "http://localhost:3001",
+    )
     
     # Logging
     LOG_LEVEL: str = "INFO"
@@ -76,21 +88,42 @@ class Settings(BaseSettings):
     
     # Session Management
     SESSION_CLEANUP_HOURS: int = 1  # TTL for active_rooms cache
+    ENABLE_BACKGROUND_CLEANUP: bool = True  # Run the periodic room/log sweep thread
     
     # Streaming / SSE
     SSE_HEARTBEAT_INTERVAL: int = 15  # seconds between heartbeat events
     SSE_RETRY_TIMEOUT: int = 5  # seconds for SSE retry timeout
     
-    class Config:
-        # Look for .env in project root (Hack_NYU/.env) first, then backend/.env
-        env_file = [
-            str(Path(__file__).parent.parent.parent.parent / ".env"),  # Hack_NYU/.env
-            str(Path(__file__).parent.parent.parent / ".env"),  # backend/.env (fallback)
-        ]
-        env_file_encoding = "utf-8"
-        case_sensitive = True
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> tuple[PydanticBaseSettingsSource, ...]:
+        """Read only init kwargs, the environment and .env; no secrets directory is used."""
+        return init_settings, env_settings, dotenv_settings
+    
+    @cached_property
+    def data_dir(self) -> Path:
+        """Directory holding the SQLite database file, derived once from DATABASE_URL."""
+        return Path(self.DATABASE_URL.replace("sqlite:///", "", 1)).parent
+
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the process-wide Settings instance.
+    
+    Settings are parsed and validated once and cached for the life of the
+    process. Clearing the cache does not reconfigure a running app: the
+    module-level `settings` below and everything built from it at import
+    (the database engine, the data directory) keep the original values.
+    """
+    return Settings()
 
-# Singleton instance
-settings = Settings()
 
+# Singleton instance (kept for existing `from .config import settings` imports)
+settings = get_settings()
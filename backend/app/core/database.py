@@ -7,35 +7,78 @@ HOW: SQLAlchemy sync engine v2 with WAL mode, session management
 """
 
 from sqlalchemy import create_engine, text, event
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from contextlib import contextmanager
-from pathlib import Path
+import asyncio
+import os
 
 from .config import settings
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-# Ensure data directory exists
-data_dir = Path(settings.DATABASE_URL.replace("sqlite:///", "")).parent
-if not data_dir.exists():
-    data_dir.mkdir(parents=True, exist_ok=True)
+# Data directory is created lazily (see _ensure_data_dir) so importing this
+# module does no filesystem I/O
+data_dir = settings.data_dir
+_DIRS_ENSURED = False
+
+
+def _ensure_data_dir() -> None:
+    """Create the database directory once per process."""
+    global _DIRS_ENSURED
+    if _DIRS_ENSURED:
+        return
+    os.makedirs(data_dir, exist_ok=True)
+    _DIRS_ENSURED = True
+
 
 # Create sync engine (Windows ARM compatible, per spec)
 engine = create_engine(
     settings.DATABASE_URL,
     connect_args={"check_same_thread": False},  # Allow multi-threaded access
+    # WAL allows concurrent readers, so give request threads their own connections
+    pool_size=10,
+    max_overflow=20,
+    pool_timeout=30,
+    pool_pre_ping=True,
+    pool_recycle=1800,
     echo=settings.DEBUG,
     future=True
 )
 
-# Enable WAL mode on connection
+# SQLite PRAGMA scopes:
+# - journal_mode=WAL is database-scoped and persists in the file, so it only
+#   needs to run on the engine's first connection.
+# - The rest are connection-scoped and reset for every new connection, so
+#   they are sent together as one script per connection.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys=ON;"  # Enable FK constraints
+    "PRAGMA synchronous=NORMAL;"  # Safe with WAL, avoids an fsync per commit
+    "PRAGMA temp_store=MEMORY;"
+    "PRAGMA cache_size=-64000;"  # ~64 MB page cache
+    "PRAGMA mmap_size=268435456;"  # Read through mmap (256 MB) instead of pread
+)
+
+
+@event.listens_for(engine, "do_connect")
+def ensure_data_dir_before_connect(dialect, conn_rec, cargs, cparams):
+    """Make sure SQLite can create the database file, even if init_db() was skipped."""
+    _ensure_data_dir()
+
+
+@event.listens_for(engine, "first_connect")
+def set_sqlite_journal_mode(dbapi_conn, connection_record):
+    """Enable WAL mode once per engine; the setting persists in the database file."""
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
+
 @event.listens_for(engine, "connect")
 def set_sqlite_pragma(dbapi_conn, connection_record):
-    """Enable WAL mode for better concurrency."""
+    """Apply per-connection PRAGMAs in a single round-trip."""
     cursor = dbapi_conn.cursor()
-    cursor.execute("PRAGMA journal_mode=WAL")
-    cursor.execute("PRAGMA foreign_keys=ON")  # Enable FK constraints
+    cursor.executescript(_CONNECTION_PRAGMAS)
     cursor.close()
 
 # Session factory
@@ -46,8 +89,9 @@ SessionLocal = sessionmaker(
     autocommit=False
 )
 
-# Base for models
-Base = declarative_base()
+# Base for models (SQLAlchemy 2.0 declarative style)
+class Base(DeclarativeBase):
+    pass
 
 
 @contextmanager
@@ -74,17 +118,15 @@ def get_db():
         session.close()
 
 
-def ping_database() -> dict:
-    """
-    Check database connectivity.
-    
-    Returns:
-        Dict with status and info
-    """
+# Built once so the statement cache key is stable across health checks
+_PING_STMT = text("SELECT 1")
+
+
+def _ping_database_sync() -> dict:
+    """Blocking connectivity check; see ping_database()."""
     try:
         with engine.connect() as conn:
-            result = conn.execute(text("SELECT 1"))
-            result.fetchone()
+            conn.scalar(_PING_STMT)
         
         return {
             "available": True,
@@ -100,20 +142,40 @@ def ping_database() -> dict:
         }
 
 
+async def ping_database() -> dict:
+    """
+    Check database connectivity.
+    
+    The sync engine blocks, so the check runs in a worker thread to keep
+    the event loop free for other requests during health checks.
+    
+    Returns:
+        Dict with status and info
+    """
+    return await asyncio.to_thread(_ping_database_sync)
+
+
 def init_db():
-    """Initialize database tables and enable WAL mode."""
-    with engine.connect() as conn:
-        # Ensure WAL mode
-        conn.execute(text("PRAGMA journal_mode=WAL"))
-        conn.execute(text("PRAGMA foreign_keys=ON"))
-        conn.commit()
+    """Initialize database tables (WAL mode is enabled on the engine's first connection)."""
+    _ensure_data_dir()
     
     # Create all tables
     Base.metadata.create_all(bind=engine)
+    
+    # Gather planner statistics once the schema is in place
+    with engine.connect() as conn:
+        conn.execute(text("ANALYZE"))
+        conn.commit()
     logger.info("Database initialized with WAL mode")
 
 
 def close_db():
-    """Close database connections."""
+    """Refresh planner statistics where needed, then close database connections."""
+    try:
+        # Cheap: only re-analyzes tables whose statistics have drifted
+        with engine.connect() as conn:
+            conn.execute(text("PRAGMA optimize"))
+    except Exception as e:
+        logger.warning(f"PRAGMA optimize failed on shutdown: {e}")
     engine.dispose()
     logger.info("Database connections closed")
@@ -7,42 +7,98 @@ HOW: SQLAlchemy v2 declarative models with CHECK constraints, FKs, indexes
 """
 
 from sqlalchemy import (
-    Column, String, Integer, Float, Text, DateTime, ForeignKey, 
-    CheckConstraint, UniqueConstraint, Index
+    String, Integer, Float, Text, DateTime, ForeignKey, 
+    CheckConstraint, UniqueConstraint, Index, BINARY, Computed, insert, text
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.sql import func
 from datetime import datetime
+from typing import Any, Dict, List, Optional
 import uuid
 
 from .database import Base
 
 
+class GUID(TypeDecorator):
+    """
+    UUID column stored in its compact form, exposed as a string.
+    
+    WHAT: 16-byte BINARY on SQLite (native UUID on PostgreSQL) instead of String(36)
+    WHY: Less than half the bytes per key in rows and every PK/FK index entry
+    HOW: Convert str <-> bytes at the bind/result boundary so callers keep str IDs
+    """
+    impl = BINARY(16)
+    cache_ok = True
+    
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=False))
+        return dialect.type_descriptor(BINARY(16))
+    
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name == "postgresql":
+            return value
+        if isinstance(value, uuid.UUID):
+            return value.bytes
+        # Raises ValueError for anything that is not a UUID; callers taking IDs
+        # from outside (URLs, request bodies) check is_guid() first
+        return uuid.UUID(value).bytes
+    
+    def process_result_value(self, value, dialect):
+        if value is None or dialect.name == "postgresql":
+            return value
+        if isinstance(value, str) or len(value) != 16:
+            raise ValueError(
+                f"GUID column holds {value!r}, not 16 UUID bytes; "
+                "run migrate_guid_binary.py on databases created before GUID keys"
+            )
+        return str(uuid.UUID(bytes=bytes(value)))
+
+
+def is_guid(value: Optional[str]) -> bool:
+    """True if value is a UUID string, i.e. can be bound to a GUID column."""
+    try:
+        uuid.UUID(value)
+    except (TypeError, ValueError, AttributeError):
+        return False
+    return True
+
+
 class Session(Base):
     """Session table - represents a configured marketplace episode."""
     __tablename__ = "sessions"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    created_at = Column(DateTime, default=func.now(), nullable=False)
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
-    status = Column(
+    id: Mapped[str] = mapped_column(GUID(), primary_key=True, default=lambda: str(uuid.uuid4()))
+    # Timestamps: default= renders now() inside the INSERT itself (still one
+    # multi-row statement), so tables created before the DDL had a DEFAULT
+    # keep accepting rows; server_default covers inserts made outside the ORM
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now(), nullable=False)
+    status: Mapped[str] = mapped_column(
         String(20),
         CheckConstraint("status IN ('draft', 'active', 'completed')"),
         default='draft',
         nullable=False
     )
-    llm_model = Column(String(100), nullable=False)
-    llm_temperature = Column(Float, default=0.7, nullable=False)
-    llm_max_tokens = Column(Integer, default=500, nullable=False)
-    llm_provider = Column(String(20), default='lm_studio', nullable=False)  # 'lm_studio' or 'openrouter'
+    llm_model: Mapped[str] = mapped_column(String(100), nullable=False)
+    llm_temperature: Mapped[float] = mapped_column(Float, default=0.7, nullable=False)
+    llm_max_tokens: Mapped[int] = mapped_column(Integer, default=500, nullable=False)
+    llm_provider: Mapped[str] = mapped_column(String(20), default='lm_studio', nullable=False)  # 'lm_studio' or 'openrouter'
     
     # Relationships
-    buyers = relationship("Buyer", back_populates="session", cascade="all, delete-orphan")
-    sellers = relationship("Seller", back_populates="session", cascade="all, delete-orphan")
-    negotiation_runs = relationship("NegotiationRun", back_populates="session", cascade="all, delete-orphan")
+    buyers: Mapped[List["Buyer"]] = relationship("Buyer", back_populates="session", cascade="all, delete-orphan", passive_deletes=True)
+    sellers: Mapped[List["Seller"]] = relationship("Seller", back_populates="session", cascade="all, delete-orphan", passive_deletes=True)
+    negotiation_runs: Mapped[List["NegotiationRun"]] = relationship("NegotiationRun", back_populates="session", cascade="all, delete-orphan", passive_deletes=True)
     
     __table_args__ = (
-        Index("idx_sessions_status", "status"),
+        # Partial: only live sessions are looked up by status; finished rows stay out of the index
+        Index(
+            "idx_sessions_status", "status",
+            sqlite_where=text("status IN ('draft', 'active')"),
+            postgresql_where=text("status IN ('draft', 'active')")
+        ),
     )
 
 
@@ -50,14 +106,14 @@ class Buyer(Base):
     """Buyer table - buyer configuration per session."""
     __tablename__ = "buyers"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    session_id = Column(String(36), ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False)
-    name = Column(String(100), nullable=False)
-    created_at = Column(DateTime, default=func.now(), nullable=False)
+    id: Mapped[str] = mapped_column(GUID(), primary_key=True, default=lambda: str(uuid.uuid4()))
+    session_id: Mapped[str] = mapped_column(GUID(), ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False)
+    name: Mapped[str] = mapped_column(String(64), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), server_default=func.now(), nullable=False)
     
     # Relationships
-    session = relationship("Session", back_populates="buyers")
-    buyer_items = relationship("BuyerItem", back_populates="buyer", cascade="all, delete-orphan")
+    session: Mapped["Session"] = relationship("Session", back_populates="buyers")
+    buyer_items: Mapped[List["BuyerItem"]] = relationship("BuyerItem", back_populates="buyer", cascade="all, delete-orphan", passive_deletes=True)
     
     __table_args__ = (
         Index("idx_buyers_session", "session_id"),
@@ -68,18 +124,18 @@ class BuyerItem(Base):
     """Buyer items table - shopping list per buyer."""
     __tablename__ = "buyer_items"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    buyer_id = Column(String(36), ForeignKey("buyers.id", ondelete="CASCADE"), nullable=False)
-    item_id = Column(String(50), nullable=False)
-    item_name = Column(String(100), nullable=False)
-    quantity_needed = Column(Integer, CheckConstraint("quantity_needed > 0"), nullable=False)
-    min_price_per_unit = Column(Float, CheckConstraint("min_price_per_unit >= 0"), nullable=False)
-    max_price_per_unit = Column(Float, nullable=False)
-    created_at = Column(DateTime, default=func.now(), nullable=False)
+    id: Mapped[str] = mapped_column(GUID(), primary_key=True, default=lambda: str(uuid.uuid4()))
+    buyer_id: Mapped[str] = mapped_column(GUID(), ForeignKey("buyers.id", ondelete="CASCADE"), nullable=False)
+    item_id: Mapped[str] = mapped_column(String(50), nullable=False)
+    item_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    quantity_needed: Mapped[int] = mapped_column(Integer, CheckConstraint("quantity_needed > 0"), nullable=False)
+    min_price_per_unit: Mapped[float] = mapped_column(Float, CheckConstraint("min_price_per_unit >= 0"), nullable=False)
+    max_price_per_unit: Mapped[float] = mapped_column(Float, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), server_default=func.now(), nullable=False)
     
     # Relationships
-    buyer = relationship("Buyer", back_populates="buyer_items")
-    negotiation_runs = relationship("NegotiationRun", back_populates="buyer_item", cascade="all, delete-orphan")
+    buyer: Mapped["Buyer"] = relationship("Buyer", back_populates="buyer_items")
+    negotiation_runs: Mapped[List["NegotiationRun"]] = relationship("NegotiationRun", back_populates="buyer_item", cascade="all, delete-orphan", passive_deletes=True)
     
     __table_args__ = (
         CheckConstraint("max_price_per_unit > min_price_per_unit"),
@@ -91,26 +147,26 @@ class Seller(Base):
     """Seller table - seller configuration per session."""
     __tablename__ = "sellers"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    session_id = Column(String(36), ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False)
-    name = Column(String(100), nullable=False)
-    priority = Column(
+    id: Mapped[str] = mapped_column(GUID(), primary_key=True, default=lambda: str(uuid.uuid4()))
+    session_id: Mapped[str] = mapped_column(GUID(), ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False)
+    name: Mapped[str] = mapped_column(String(64), nullable=False)
+    priority: Mapped[str] = mapped_column(
         String(20),
         CheckConstraint("priority IN ('customer_retention', 'maximize_profit')"),
         nullable=False
     )
-    speaking_style = Column(
+    speaking_style: Mapped[str] = mapped_column(
         String(20),
         CheckConstraint("speaking_style IN ('rude', 'very_sweet')"),
         nullable=False
     )
-    created_at = Column(DateTime, default=func.now(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), server_default=func.now(), nullable=False)
     
     # Relationships
-    session = relationship("Session", back_populates="sellers")
-    inventory = relationship("SellerInventory", back_populates="seller", cascade="all, delete-orphan")
-    negotiation_participants = relationship("NegotiationParticipant", back_populates="seller", cascade="all, delete-orphan")
-    offers = relationship("Offer", back_populates="seller")
+    session: Mapped["Session"] = relationship("Session", back_populates="sellers")
+    inventory: Mapped[List["SellerInventory"]] = relationship("SellerInventory", back_populates="seller", cascade="all, delete-orphan", passive_deletes=True)
+    negotiation_participants: Mapped[List["NegotiationParticipant"]] = relationship("NegotiationParticipant", back_populates="seller", cascade="all, delete-orphan", passive_deletes=True)
+    offers: Mapped[List["Offer"]] = relationship("Offer", back_populates="seller", passive_deletes=True)
     
     __table_args__ = (
         Index("idx_sellers_session", "session_id"),
@@ -121,18 +177,18 @@ class SellerInventory(Base):
     """Seller inventory table - items available per seller."""
     __tablename__ = "seller_inventory"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    seller_id = Column(String(36), ForeignKey("sellers.id", ondelete="CASCADE"), nullable=False)
-    item_id = Column(String(50), nullable=False)
-    item_name = Column(String(100), nullable=False)
-    cost_price = Column(Float, CheckConstraint("cost_price >= 0"), nullable=False)
-    selling_price = Column(Float, CheckConstraint("selling_price > cost_price"), nullable=False)
-    least_price = Column(Float, nullable=False)
-    quantity_available = Column(Integer, CheckConstraint("quantity_available >= 0"), nullable=False)
-    created_at = Column(DateTime, default=func.now(), nullable=False)
+    id: Mapped[str] = mapped_column(GUID(), primary_key=True, default=lambda: str(uuid.uuid4()))
+    seller_id: Mapped[str] = mapped_column(GUID(), ForeignKey("sellers.id", ondelete="CASCADE"), nullable=False)
+    item_id: Mapped[str] = mapped_column(String(50), nullable=False)
+    item_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    cost_price: Mapped[float] = mapped_column(Float, CheckConstraint("cost_price >= 0"), nullable=False)
+    selling_price: Mapped[float] = mapped_column(Float, CheckConstraint("selling_price > cost_price"), nullable=False)
+    least_price: Mapped[float] = mapped_column(Float, nullable=False)
+    quantity_available: Mapped[int] = mapped_column(Integer, CheckConstraint("quantity_available >= 0"), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), server_default=func.now(), nullable=False)
     
     # Relationships
-    seller = relationship("Seller", back_populates="inventory")
+    seller: Mapped["Seller"] = relationship("Seller", back_populates="inventory")
     
     __table_args__ = (
         CheckConstraint("least_price > cost_price AND least_price < selling_price"),
@@ -142,35 +198,62 @@ class SellerInventory(Base):
     )
 
 
+def upsert_inventory(session, rows: List[Dict[str, Any]]) -> None:
+    """
+    Insert seller inventory rows, skipping (seller_id, item_id) pairs that already exist.
+
+    WHAT: Idempotent inventory seeding
+    WHY: Going through session.add(), a repeated item trips uq_seller_inventory_item
+         and forces callers to catch IntegrityError
+    HOW: One executemany INSERT ... ON CONFLICT DO NOTHING on the unique pair
+
+    Args:
+        session: SQLAlchemy session
+        rows: Column dicts for SellerInventory, all with the same keys
+    """
+    if not rows:
+        return
+    dialect_insert = postgresql.insert if session.get_bind().dialect.name == "postgresql" else sqlite.insert
+    stmt = dialect_insert(SellerInventory).on_conflict_do_nothing(
+        index_elements=["seller_id", "item_id"]
+    )
+    session.execute(stmt, rows)
+
+
 class NegotiationRun(Base):
     """Negotiation runs table - individual negotiation per item."""
     __tablename__ = "negotiation_runs"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    session_id = Column(String(36), ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False)
-    buyer_item_id = Column(String(36), ForeignKey("buyer_items.id", ondelete="CASCADE"), nullable=False)
-    status = Column(
+    id: Mapped[str] = mapped_column(GUID(), primary_key=True, default=lambda: str(uuid.uuid4()))
+    session_id: Mapped[str] = mapped_column(GUID(), ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False)
+    buyer_item_id: Mapped[str] = mapped_column(GUID(), ForeignKey("buyer_items.id", ondelete="CASCADE"), nullable=False)
+    status: Mapped[str] = mapped_column(
         String(20),
         CheckConstraint("status IN ('pending', 'active', 'completed', 'no_sellers_available', 'aborted')"),
         default='pending',
         nullable=False
     )
-    started_at = Column(DateTime, nullable=True)
-    ended_at = Column(DateTime, nullable=True)
-    current_round = Column(Integer, default=0, nullable=False)
-    max_rounds = Column(Integer, default=10, nullable=False)
-    created_at = Column(DateTime, default=func.now(), nullable=False)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    ended_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    current_round: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    max_rounds: Mapped[int] = mapped_column(Integer, default=10, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), server_default=func.now(), nullable=False)
     
     # Relationships
-    session = relationship("Session", back_populates="negotiation_runs")
-    buyer_item = relationship("BuyerItem", back_populates="negotiation_runs")
-    participants = relationship("NegotiationParticipant", back_populates="negotiation_run", cascade="all, delete-orphan")
-    messages = relationship("Message", back_populates="negotiation_run", cascade="all, delete-orphan")
-    outcome = relationship("NegotiationOutcome", back_populates="negotiation_run", uselist=False, cascade="all, delete-orphan")
+    session: Mapped["Session"] = relationship("Session", back_populates="negotiation_runs")
+    buyer_item: Mapped["BuyerItem"] = relationship("BuyerItem", back_populates="negotiation_runs")
+    participants: Mapped[List["NegotiationParticipant"]] = relationship("NegotiationParticipant", back_populates="negotiation_run", cascade="all, delete-orphan", passive_deletes=True)
+    messages: Mapped[List["Message"]] = relationship("Message", back_populates="negotiation_run", cascade="all, delete-orphan", passive_deletes=True)
+    outcome: Mapped[Optional["NegotiationOutcome"]] = relationship("NegotiationOutcome", back_populates="negotiation_run", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
     
     __table_args__ = (
         Index("idx_negotiation_runs_session", "session_id"),
-        Index("idx_negotiation_runs_status", "status"),
+        # Partial: covers only pending/active runs, not the completed backlog
+        Index(
+            "idx_negotiation_runs_status", "status",
+            sqlite_where=text("status IN ('pending', 'active')"),
+            postgresql_where=text("status IN ('pending', 'active')")
+        ),
     )
 
 
@@ -178,67 +261,156 @@ class NegotiationParticipant(Base):
     """Negotiation participants table - sellers participating in a run."""
     __tablename__ = "negotiation_participants"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    negotiation_run_id = Column(String(36), ForeignKey("negotiation_runs.id", ondelete="CASCADE"), nullable=False)
-    seller_id = Column(String(36), ForeignKey("sellers.id", ondelete="CASCADE"), nullable=False)
-    joined_at = Column(DateTime, default=func.now(), nullable=False)
+    id: Mapped[str] = mapped_column(GUID(), primary_key=True, default=lambda: str(uuid.uuid4()))
+    negotiation_run_id: Mapped[str] = mapped_column(GUID(), ForeignKey("negotiation_runs.id", ondelete="CASCADE"), nullable=False)
+    seller_id: Mapped[str] = mapped_column(GUID(), ForeignKey("sellers.id", ondelete="CASCADE"), nullable=False)
+    joined_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), server_default=func.now(), nullable=False)
     
     # Relationships
-    negotiation_run = relationship("NegotiationRun", back_populates="participants")
-    seller = relationship("Seller", back_populates="negotiation_participants")
+    negotiation_run: Mapped["NegotiationRun"] = relationship("NegotiationRun", back_populates="participants")
+    seller: Mapped["Seller"] = relationship("Seller", back_populates="negotiation_participants")
     
     __table_args__ = (
         UniqueConstraint("negotiation_run_id", "seller_id", name="uq_negotiation_participant"),
     )
 
 
+def create_participants(session, participants: Dict[str, List[str]]) -> None:
+    """
+    Add the participating sellers of one or more negotiation runs in one statement.
+    
+    Args:
+        session: SQLAlchemy session
+        participants: Negotiation run ID -> IDs of its participating sellers
+    """
+    rows = [
+        {"negotiation_run_id": run_id, "seller_id": seller_id}
+        for run_id, seller_ids in participants.items()
+        for seller_id in seller_ids
+    ]
+    if not rows:
+        return
+    session.execute(insert(NegotiationParticipant), rows)
+
+
 class Message(Base):
     """Messages table - conversation history."""
     __tablename__ = "messages"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    negotiation_run_id = Column(String(36), ForeignKey("negotiation_runs.id", ondelete="CASCADE"), nullable=False)
-    turn_number = Column(Integer, nullable=False)
-    sender_type = Column(
+    # Explicit sentinel: batched INSERT..RETURNING correlates rows by this client-side key
+    id: Mapped[str] = mapped_column(GUID(), primary_key=True, insert_sentinel=True, default=lambda: str(uuid.uuid4()))
+    negotiation_run_id: Mapped[str] = mapped_column(GUID(), ForeignKey("negotiation_runs.id", ondelete="CASCADE"), nullable=False)
+    turn_number: Mapped[int] = mapped_column(Integer, nullable=False)
+    sender_type: Mapped[str] = mapped_column(
         String(10),
         CheckConstraint("sender_type IN ('buyer', 'seller')"),
         nullable=False
     )
-    sender_id = Column(String(36), nullable=False)  # References buyers.id or sellers.id
-    sender_name = Column(String(100), nullable=False)
-    message_text = Column(Text, nullable=False)
-    mentioned_agents = Column(Text, nullable=True)  # JSON array of mentioned seller IDs
-    timestamp = Column(DateTime, default=func.now(), nullable=False)
+    sender_id: Mapped[str] = mapped_column(String(36), nullable=False)  # References buyers.id or sellers.id
+    sender_name: Mapped[str] = mapped_column(String(64), nullable=False)
+    message_text: Mapped[str] = mapped_column(Text, nullable=False)
+    timestamp: Mapped[datetime] = mapped_column(DateTime, default=func.now(), server_default=func.now(), nullable=False)
     
     # Relationships
-    negotiation_run = relationship("NegotiationRun", back_populates="messages")
-    offer = relationship("Offer", back_populates="message", uselist=False, cascade="all, delete-orphan")
+    negotiation_run: Mapped["NegotiationRun"] = relationship("NegotiationRun", back_populates="messages")
+    offer: Mapped[Optional["Offer"]] = relationship("Offer", back_populates="message", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
+    # Loaded on access only; queries that build mentioned_agents add selectinload(Message.mentions)
+    mentions: Mapped[List["MessageMention"]] = relationship("MessageMention", back_populates="message", cascade="all, delete-orphan", passive_deletes=True, lazy="select")
+    
+    @property
+    def mentioned_agents(self) -> List[str]:
+        """IDs of the sellers @-mentioned in this message."""
+        return [mention.seller_id for mention in self.mentions]
+    
+    @mentioned_agents.setter
+    def mentioned_agents(self, seller_ids: Optional[List[str]]) -> None:
+        # dict.fromkeys drops duplicates (the table's PK) while keeping order
+        self.mentions = [MessageMention(seller_id=seller_id) for seller_id in dict.fromkeys(seller_ids or [])]
     
     __table_args__ = (
         Index("idx_messages_negotiation", "negotiation_run_id"),
-        Index("idx_messages_turn", "negotiation_run_id", "turn_number"),
+        # Covering on PostgreSQL so conversation replays skip the heap fetch
+        Index(
+            "idx_messages_turn", "negotiation_run_id", "turn_number",
+            postgresql_include=["sender_type", "sender_id", "timestamp"]
+        ),
+        # Append-ordered timestamps: a BRIN index serves time-range scans at a
+        # fraction of a B-tree's size (PostgreSQL only; SQLite has no BRIN)
+        Index(
+            "idx_messages_ts_brin", "timestamp",
+            postgresql_using="brin", postgresql_with={"pages_per_range": 32}
+        ).ddl_if(dialect="postgresql"),
+    )
+
+
+class MessageMention(Base):
+    """Message mentions table - sellers @-mentioned in a message."""
+    __tablename__ = "message_mentions"
+    
+    message_id: Mapped[str] = mapped_column(GUID(), ForeignKey("messages.id", ondelete="CASCADE"), primary_key=True)
+    seller_id: Mapped[str] = mapped_column(GUID(), ForeignKey("sellers.id", ondelete="CASCADE"), primary_key=True)
+    
+    # Relationships
+    message: Mapped["Message"] = relationship("Message", back_populates="mentions")
+    
+    __table_args__ = (
+        Index("idx_mentions_seller", "seller_id"),
     )
 
 
+def bulk_insert_messages(session, rows: List[Dict[str, Any]]) -> None:
+    """
+    Insert many messages, and their mentions, with one statement per table.
+
+    WHAT: Batch write path for a negotiation's conversation history
+    WHY: session.add() per message costs one INSERT and unit-of-work pass per row
+    HOW: executemany-style Core inserts, which SQLAlchemy's insertmanyvalues
+         turns into multi-VALUES statements
+
+    Args:
+        session: SQLAlchemy session
+        rows: Message column dicts with pre-generated "id"s, all with the same
+            keys, plus a "mentioned_agents" list of seller IDs per row
+    """
+    if not rows:
+        return
+    message_rows = []
+    mention_rows = []
+    for row in rows:
+        row = dict(row)
+        # dict.fromkeys drops duplicates (the table's PK) while keeping order
+        for seller_id in dict.fromkeys(row.pop("mentioned_agents", None) or []):
+            mention_rows.append({"message_id": row["id"], "seller_id": seller_id})
+        message_rows.append(row)
+    session.execute(insert(Message), message_rows)
+    if mention_rows:
+        session.execute(insert(MessageMention), mention_rows)
+
+
 class Offer(Base):
     """Offers table - seller offers linked to messages."""
     __tablename__ = "offers"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    message_id = Column(String(36), ForeignKey("messages.id", ondelete="CASCADE"), nullable=False)
-    seller_id = Column(String(36), ForeignKey("sellers.id", ondelete="CASCADE"), nullable=False)
-    price_per_unit = Column(Float, CheckConstraint("price_per_unit > 0"), nullable=False)
-    quantity = Column(Integer, CheckConstraint("quantity > 0"), nullable=False)
-    conditions = Column(Text, nullable=True)  # Optional conditions or terms
-    timestamp = Column(DateTime, default=func.now(), nullable=False)
+    id: Mapped[str] = mapped_column(GUID(), primary_key=True, insert_sentinel=True, default=lambda: str(uuid.uuid4()))
+    message_id: Mapped[str] = mapped_column(GUID(), ForeignKey("messages.id", ondelete="CASCADE"), nullable=False)
+    seller_id: Mapped[str] = mapped_column(GUID(), ForeignKey("sellers.id", ondelete="CASCADE"), nullable=False)
+    price_per_unit: Mapped[float] = mapped_column(Float, CheckConstraint("price_per_unit > 0"), nullable=False)
+    quantity: Mapped[int] = mapped_column(Integer, CheckConstraint("quantity > 0"), nullable=False)
+    # Optional conditions or terms; deferred since list/replay reads never use it
+    conditions: Mapped[Optional[str]] = mapped_column(Text, nullable=True, deferred=True, deferred_group="body")
+    timestamp: Mapped[datetime] = mapped_column(DateTime, default=func.now(), server_default=func.now(), nullable=False)
     
     # Relationships
-    message = relationship("Message", back_populates="offer")
-    seller = relationship("Seller", back_populates="offers")
+    message: Mapped["Message"] = relationship("Message", back_populates="offer")
+    seller: Mapped["Seller"] = relationship("Seller", back_populates="offers")
     
     __table_args__ = (
-        Index("idx_offers_message", "message_id"),
-        Index("idx_offers_seller", "seller_id"),
+        Index("idx_offers_message", "message_id", postgresql_include=["price_per_unit", "quantity", "timestamp"]),
+        Index("idx_offers_seller", "seller_id", postgresql_include=["price_per_unit", "quantity", "timestamp"]),
+        Index(
+            "idx_offers_ts_brin", "timestamp",
+            postgresql_using="brin", postgresql_with={"pages_per_range": 32}
+        ).ddl_if(dialect="postgresql"),
     )
 
 
@@ -246,24 +418,33 @@ class NegotiationOutcome(Base):
     """Negotiation outcomes table - final decision per run."""
     __tablename__ = "negotiation_outcomes"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    negotiation_run_id = Column(String(36), ForeignKey("negotiation_runs.id", ondelete="CASCADE"), nullable=False, unique=True)
-    decision_type = Column(
+    id: Mapped[str] = mapped_column(GUID(), primary_key=True, default=lambda: str(uuid.uuid4()))
+    negotiation_run_id: Mapped[str] = mapped_column(GUID(), ForeignKey("negotiation_runs.id", ondelete="CASCADE"), nullable=False, unique=True)
+    decision_type: Mapped[str] = mapped_column(
         String(20),
         CheckConstraint("decision_type IN ('deal', 'no_deal')"),
         nullable=False
     )
-    selected_seller_id = Column(String(36), ForeignKey("sellers.id"), nullable=True)
-    final_price_per_unit = Column(Float, nullable=True)
-    quantity = Column(Integer, nullable=True)
-    total_cost = Column(Float, nullable=True)
-    decision_reason = Column(Text, nullable=True)
-    timestamp = Column(DateTime, default=func.now(), nullable=False)
+    selected_seller_id: Mapped[Optional[str]] = mapped_column(GUID(), ForeignKey("sellers.id"), nullable=True)
+    final_price_per_unit: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    quantity: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Computed by the database on write, so it can never drift from price * quantity
+    total_cost: Mapped[Optional[float]] = mapped_column(
+        Float, Computed("final_price_per_unit * quantity", persisted=True), nullable=True
+    )
+    # Deferred: summary listings skip it; detail reads use undefer_group("body")
+    decision_reason: Mapped[Optional[str]] = mapped_column(Text, nullable=True, deferred=True, deferred_group="body")
+    timestamp: Mapped[datetime] = mapped_column(DateTime, default=func.now(), server_default=func.now(), nullable=False)
     
     # Relationships
-    negotiation_run = relationship("NegotiationRun", back_populates="outcome")
+    negotiation_run: Mapped["NegotiationRun"] = relationship("NegotiationRun", back_populates="outcome")
     
     __table_args__ = (
         Index("idx_outcomes_negotiation", "negotiation_run_id"),
     )
 
+
+
+# Wire up all relationships now, at import, rather than on the first query
+# of each process
+Base.registry.configure()
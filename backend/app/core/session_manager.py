@@ -8,16 +8,29 @@ HOW: Database operations + in-memory cache with TTL
 
 import uuid
 import json
-import asyncio
+import atexit
+import heapq
+import os
+import queue
+import shutil
+import threading
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from pathlib import Path
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, insert, select, update
+
+try:
+    import orjson  # Optional: C encoder for negotiation logs
+except ImportError:
+    orjson = None
+from sqlalchemy.orm import Session, selectinload, undefer_group
 
 from .database import get_db
 from .models import (
     Session as SessionModel, Buyer, BuyerItem, Seller, SellerInventory,
-    NegotiationRun, NegotiationParticipant, Message, Offer, NegotiationOutcome
+    NegotiationRun, NegotiationParticipant, Message, MessageMention, Offer, NegotiationOutcome,
+    bulk_insert_messages, create_participants, is_guid, upsert_inventory
 )
 from .config import settings
 from ..models.api_schemas import (
@@ -25,13 +38,162 @@ from ..models.api_schemas import (
 )
 from ..models.negotiation import NegotiationRoomState
 from ..models.agent import BuyerConstraints, Seller as SellerModel, InventoryItem, SellerProfile
-from ..services.seller_selection import select_sellers_for_item
+from ..services.seller_selection import index_inventories, select_sellers_for_item
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+
+class _RoomCache(dict):
+    """
+    Active-room dict that also keeps its entries ordered by timestamp.
+    
+    WHAT: room_id -> (room_state, created_at), plus a min-heap of (created_at, room_id)
+    WHY: TTL cleanup pops only the expired entries instead of scanning every room
+    HOW: Every assignment pushes onto the heap; entries replaced or removed since
+         are skipped lazily when popped, since their timestamp no longer matches
+    
+    Reads, pops and deletes are single dict operations and stay lock-free. Only
+    the heap and the cleanup's check-then-remove share a short-held lock, so
+    request threads never wait on a sweep beyond a few heap operations.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self._expiry_heap: List[Tuple[datetime, str]] = []
+        self._lock = threading.Lock()
+    
+    def __setitem__(self, room_id: str, entry: tuple) -> None:
+        with self._lock:
+            super().__setitem__(room_id, entry)
+            heapq.heappush(self._expiry_heap, (entry[1], room_id))
+    
+    def clear(self) -> None:
+        with self._lock:
+            super().clear()
+            self._expiry_heap.clear()
+    
+    def pop_expired(self, cutoff: datetime) -> List[str]:
+        """Remove and return the IDs of rooms whose timestamp is older than cutoff."""
+        heap = self._expiry_heap
+        expired = []
+        with self._lock:
+            while heap and heap[0][0] < cutoff:
+                ts, room_id = heapq.heappop(heap)
+                entry = self.get(room_id)
+                # Stale heap entry: the room was removed or re-stamped since
+                if entry is None or entry[1] != ts:
+                    continue
+                self.pop(room_id, None)
+                expired.append(room_id)
+        return expired
+
+
 # In-memory cache for active rooms (room_id -> (room_state, created_at))
-active_rooms: Dict[str, tuple] = {}
+active_rooms: _RoomCache = _RoomCache()
+
+
+# json.dump emits many small chunks; a large buffer turns them into a few writes
+_LOG_WRITE_BUFFER = 1 << 20
+
+
+def _write_log_file(log_file: Path, log_data: dict) -> None:
+    """
+    Write one negotiation log atomically.
+    
+    Writes a sibling temp file and renames it over the target, so readers
+    never see a half-written log and a crash leaves the old file intact.
+    """
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = log_file.with_suffix(".json.tmp")
+    try:
+        if orjson is not None:
+            with open(tmp_file, 'wb', buffering=_LOG_WRITE_BUFFER) as f:
+                f.write(orjson.dumps(log_data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(tmp_file, 'w', encoding='utf-8', buffering=_LOG_WRITE_BUFFER) as f:
+                json.dump(log_data, f, indent=2)
+        os.replace(tmp_file, log_file)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+
+
+class _LogWriter:
+    """
+    Background writer for negotiation JSON logs.
+    
+    WHAT: One daemon thread draining a queue of (log_file, log_data) pairs
+    WHY: Keep JSON encoding and disk I/O out of finalize_run's caller
+    HOW: queue.Queue with a single consumer; flush() joins the queue
+    """
+    
+    def __init__(self):
+        self._queue: "queue.Queue[Tuple[Path, dict]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        # log_file -> writes queued or in progress, so readers can wait for one file
+        self._pending: Dict[Path, int] = {}
+        self._pending_changed = threading.Condition()
+    
+    def submit(self, log_file: Path, log_data: dict) -> None:
+        """Queue a fully built log for writing; starts the thread on first use."""
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                    self._thread.start()
+        with self._pending_changed:
+            self._pending[log_file] = self._pending.get(log_file, 0) + 1
+        self._queue.put((log_file, log_data))
+    
+    def flush(self) -> None:
+        """Block until every queued log has been written (or has failed)."""
+        self._queue.join()
+    
+    def is_pending(self, log_file: Path) -> bool:
+        """True while a write of log_file is queued or in progress."""
+        with self._pending_changed:
+            return log_file in self._pending
+    
+    def wait(self, log_file: Path, timeout: Optional[float] = None) -> bool:
+        """Block until no write of log_file is pending; False if timeout expired first."""
+        with self._pending_changed:
+            return self._pending_changed.wait_for(lambda: log_file not in self._pending, timeout)
+    
+    def _run(self) -> None:
+        while True:
+            log_file, log_data = self._queue.get()
+            try:
+                _write_log_file(log_file, log_data)
+                logger.info(f"Wrote JSON log to {log_file}")
+            except Exception as e:
+                logger.error(f"Failed to write JSON log {log_file}: {e}")
+            finally:
+                with self._pending_changed:
+                    remaining = self._pending.pop(log_file) - 1
+                    if remaining:
+                        self._pending[log_file] = remaining
+                    self._pending_changed.notify_all()
+                self._queue.task_done()
+
+
+# Shared by every SessionManager; drained at interpreter exit so queued logs are not lost
+_log_writer = _LogWriter()
+atexit.register(_log_writer.flush)
+
+# Run statuses from which a negotiation may be restarted
+_RESTARTABLE_STATUSES = frozenset({"completed", "aborted"})
+
+
+@dataclass(slots=True, frozen=True)
+class OutcomePayload:
+    """Outcome captured from a finished negotiation, ready for finalize_run."""
+    decision_type: str  # 'deal' or 'no_deal'
+    selected_seller_id: Optional[str] = None
+    final_price_per_unit: Optional[float] = None
+    quantity: Optional[int] = None
+    decision_reason: Optional[str] = None
 
 
 class SessionManager:
@@ -39,34 +201,72 @@ class SessionManager:
     
     def __init__(self):
         """Initialize session manager."""
-        self.cleanup_task = None
-        self._start_cleanup_task()
-    
-    def _start_cleanup_task(self):
-        """Start background task to clean up expired rooms."""
-        async def cleanup_expired_rooms():
-            while True:
-                try:
-                    await asyncio.sleep(settings.SESSION_CLEANUP_HOURS * 3600)  # Convert hours to seconds
-                    self._cleanup_expired_rooms()
-                except Exception as e:
-                    logger.error(f"Error in cleanup task: {e}")
-        
-        # Note: In a real async context, this would be started properly
-        # For now, we'll clean up synchronously when needed
-        pass
+        # Settings are frozen, so the log root is fixed for the process
+        self._logs_root = Path(settings.LOGS_DIR)
+        self._stop_event = threading.Event()
+        self._cleanup_thread: Optional[threading.Thread] = None
+    
+    def start_cleanup(self):
+        """
+        Start the background cleanup loop.
+        
+        WHAT: One long-lived daemon thread for room TTL and log retention sweeps
+        WHY: A single waiting loop cannot double-arm or spawn a thread per tick
+        HOW: Event.wait(interval) between sweeps; shutdown() sets the event
+        
+        No-op when ENABLE_BACKGROUND_CLEANUP is off (e.g. test/CI runs).
+        """
+        if not settings.ENABLE_BACKGROUND_CLEANUP:
+            logger.info("Background cleanup disabled (ENABLE_BACKGROUND_CLEANUP=false)")
+            return
+        if self._cleanup_thread is not None and self._cleanup_thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._cleanup_thread = threading.Thread(
+            target=self._cleanup_loop, name="session-cleanup", daemon=True
+        )
+        self._cleanup_thread.start()
+    
+    def shutdown(self, timeout: Optional[float] = None):
+        """Stop the cleanup loop and wait for an in-progress sweep and queued log writes."""
+        self._stop_event.set()
+        if self._cleanup_thread is not None:
+            self._cleanup_thread.join(timeout)
+            self._cleanup_thread = None
+        self.flush_logs()
+    
+    @staticmethod
+    def flush_logs():
+        """Block until every JSON log queued by finalize_run is on disk."""
+        _log_writer.flush()
+    
+    def log_path(self, session_id: str, run_id: str) -> Path:
+        """Where finalize_run writes a run's JSON log."""
+        return self._logs_root / session_id / run_id / f"{run_id}.json"
+    
+    def log_write_pending(self, session_id: str, run_id: str) -> bool:
+        """True while a run's JSON log is queued or being written."""
+        return _log_writer.is_pending(self.log_path(session_id, run_id))
+    
+    def wait_for_log(self, session_id: str, run_id: str, timeout: Optional[float] = None) -> bool:
+        """Block until a run's queued JSON log is on disk; False if timeout expired first."""
+        return _log_writer.wait(self.log_path(session_id, run_id), timeout)
+    
+    def _cleanup_loop(self):
+        """Sweep expired rooms and old logs every SESSION_CLEANUP_HOURS until stopped."""
+        interval = settings.SESSION_CLEANUP_HOURS * 3600  # Convert hours to seconds
+        # wait() returns True once shutdown() sets the event
+        while not self._stop_event.wait(interval):
+            try:
+                self._cleanup_expired_rooms()
+                self.cleanup_old_logs()
+            except Exception as e:
+                logger.error(f"Error in cleanup task: {e}")
     
     def _cleanup_expired_rooms(self):
         """Remove expired rooms from cache."""
-        now = datetime.now()
-        expired = []
-        for room_id, (room_state, created_at) in active_rooms.items():
-            age = now - created_at
-            if age > timedelta(hours=settings.SESSION_CLEANUP_HOURS):
-                expired.append(room_id)
-        
-        for room_id in expired:
-            del active_rooms[room_id]
+        cutoff = datetime.now() - timedelta(hours=settings.SESSION_CLEANUP_HOURS)
+        for room_id in active_rooms.pop_expired(cutoff):
             logger.info(f"Cleaned up expired room: {room_id}")
     
     def create_session(
@@ -100,7 +300,6 @@ class SessionManager:
                 llm_provider=llm_provider
             )
             db.add(session)
-            db.flush()
             
             # Create buyer
             buyer_id = str(uuid.uuid4())
@@ -110,12 +309,10 @@ class SessionManager:
                 name=request.buyer.name
             )
             db.add(buyer)
-            db.flush()
             
             # Create buyer items
-            buyer_items = []
-            for item in request.buyer.shopping_list:
-                buyer_item = BuyerItem(
+            buyer_items = [
+                BuyerItem(
                     id=str(uuid.uuid4()),
                     buyer_id=buyer_id,
                     item_id=item.item_id,
@@ -124,96 +321,93 @@ class SessionManager:
                     min_price_per_unit=item.min_price_per_unit,
                     max_price_per_unit=item.max_price_per_unit
                 )
-                db.add(buyer_item)
-                buyer_items.append(buyer_item)
-            
-            db.flush()
+                for item in request.buyer.shopping_list
+            ]
+            db.add_all(buyer_items)
             
-            # Create sellers
+            # Create sellers and their inventory; IDs are assigned here, so no
+            # flush is needed to link children to parents
             seller_ids = []
-            sellers_orm = []
+            all_sellers = []
+            all_inventories = []
+            inventory_rows = []
             for seller_config in request.sellers:
                 seller_id = str(uuid.uuid4())
-                seller = Seller(
+                all_sellers.append(Seller(
                     id=seller_id,
                     session_id=session_id,
                     name=seller_config.name,
                     priority=seller_config.profile.priority,
                     speaking_style=seller_config.profile.speaking_style
-                )
-                db.add(seller)
-                db.flush()
-                
-                # Create seller inventory
-                inventory_list = []
-                for inv_item in seller_config.inventory:
-                    seller_inv = SellerInventory(
-                        id=str(uuid.uuid4()),
-                        seller_id=seller_id,
-                        item_id=inv_item.item_id,
-                        item_name=inv_item.item_name,
-                        cost_price=inv_item.cost_price,
-                        selling_price=inv_item.selling_price,
-                        least_price=inv_item.least_price,
-                        quantity_available=inv_item.quantity_available
-                    )
-                    db.add(seller_inv)
-                    inventory_list.append(seller_inv)
-                
+                ))
+                rows = [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "seller_id": seller_id,
+                        "item_id": inv_item.item_id,
+                        "item_name": inv_item.item_name,
+                        "cost_price": inv_item.cost_price,
+                        "selling_price": inv_item.selling_price,
+                        "least_price": inv_item.least_price,
+                        "quantity_available": inv_item.quantity_available
+                    }
+                    for inv_item in seller_config.inventory
+                ]
+                inventory_rows.extend(rows)
+                # Never added to the session: seller selection only reads their attributes
+                all_inventories.append([SellerInventory(**row) for row in rows])
                 seller_ids.append(seller_id)
-                sellers_orm.append((seller, inventory_list))
             
-            db.commit()
+            db.add_all(all_sellers)
+            
+            # One flush: a multi-row INSERT per table. Unlike a commit, it keeps
+            # the objects loaded for seller selection below
+            db.flush()
+            
+            # Inventory is write-only here, so it skips the unit of work: one
+            # executemany Core INSERT, like the runs and participants below. An
+            # item listed twice for a seller keeps its first entry instead of
+            # failing the whole session on uq_seller_inventory_item
+            upsert_inventory(db, inventory_rows)
             
             # Create negotiation rooms using seller selection
             negotiation_rooms = []
             skipped_items = []
+            run_rows = []
+            run_sellers: Dict[str, List[str]] = {}
+            
+            # Index inventories by item name once, not per buyer item
+            inventory_indexes = index_inventories(all_inventories)
             
             for buyer_item in buyer_items:
-                # Get all sellers and their inventories for this session
-                all_sellers = [s for s, _ in sellers_orm]
-                all_inventories = [inv for _, inv in sellers_orm]
-                
                 # Select participating sellers
                 participating_sellers, skipped_reasons = select_sellers_for_item(
                     buyer_item,
                     all_sellers,
-                    all_inventories
+                    all_inventories,
+                    inventory_indexes
                 )
                 
                 if not participating_sellers:
                     skipped_items.append(buyer_item.item_name)
                     # Create run with no_sellers_available status
-                    run = NegotiationRun(
-                        id=str(uuid.uuid4()),
-                        session_id=session_id,
-                        buyer_item_id=buyer_item.id,
-                        status='no_sellers_available'
-                    )
-                    db.add(run)
+                    run_rows.append({
+                        "id": str(uuid.uuid4()),
+                        "session_id": session_id,
+                        "buyer_item_id": buyer_item.id,
+                        "status": 'no_sellers_available'
+                    })
                     continue
                 
                 # Create negotiation run
                 room_id = str(uuid.uuid4())
-                run = NegotiationRun(
-                    id=room_id,
-                    session_id=session_id,
-                    buyer_item_id=buyer_item.id,
-                    status='pending'
-                )
-                db.add(run)
-                db.flush()
-                
-                # Create participants
-                for seller in participating_sellers:
-                    participant = NegotiationParticipant(
-                        id=str(uuid.uuid4()),
-                        negotiation_run_id=room_id,
-                        seller_id=seller.id
-                    )
-                    db.add(participant)
-                
-                db.flush()
+                run_rows.append({
+                    "id": room_id,
+                    "session_id": session_id,
+                    "buyer_item_id": buyer_item.id,
+                    "status": 'pending'
+                })
+                run_sellers[room_id] = [seller.id for seller in participating_sellers]
                 
                 # Build room info
                 from ..models.api_schemas import SellerParticipant
@@ -245,6 +439,13 @@ class SessionManager:
                 )
                 negotiation_rooms.append(room_info)
             
+            # Runs must exist before the participant rows that reference them.
+            # Their IDs are generated here, so a plain executemany INSERT is
+            # enough: no ORM objects, no RETURNING round trip
+            if run_rows:
+                db.execute(insert(NegotiationRun), run_rows)
+            create_participants(db, run_sellers)
+            
             db.commit()
             
             logger.info(f"Created session {session_id} with {len(negotiation_rooms)} rooms")
@@ -269,6 +470,8 @@ class SessionManager:
         Returns:
             Dict with session details or None if not found
         """
+        if not is_guid(session_id):
+            return None
         with get_db() as db:
             session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
             if not session:
@@ -296,13 +499,17 @@ class SessionManager:
         Returns:
             Dict with deletion status
         """
+        if not is_guid(session_id):
+            return {"deleted": False, "error": "Session not found"}
         with get_db() as db:
             session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
             if not session:
                 return {"deleted": False, "error": "Session not found"}
             
-            # Get all run IDs for this session to clear cache
-            run_ids = [run.id for run in db.query(NegotiationRun).filter(NegotiationRun.session_id == session_id).all()]
+            # Get all run IDs for this session to clear cache (ID column only, no ORM rows)
+            run_ids = db.scalars(
+                select(NegotiationRun.id).where(NegotiationRun.session_id == session_id)
+            ).all()
             
             # Cascade delete will handle related records
             db.delete(session)
@@ -310,8 +517,7 @@ class SessionManager:
             
             # Clear cache entries for all runs in this session
             for run_id in run_ids:
-                if run_id in active_rooms:
-                    del active_rooms[run_id]
+                active_rooms.pop(run_id, None)
             
             logger.info(f"Deleted session {session_id}")
             return {"deleted": True, "session_id": session_id}
@@ -330,32 +536,59 @@ class SessionManager:
         Returns:
             Dict with run details
         """
+        if not is_guid(room_id):
+            return {"error": "Run not found"}
         with get_db() as db:
-            run = db.query(NegotiationRun).filter(NegotiationRun.id == room_id).first()
+            # Every scalar the room state needs, from run, session, buyer item and
+            # buyer, as one plain row: no ORM objects to load, track or expire
+            run = db.execute(
+                select(
+                    NegotiationRun.status,
+                    NegotiationRun.max_rounds,
+                    SessionModel.llm_provider,
+                    SessionModel.llm_model,
+                    Buyer.id.label("buyer_id"),
+                    Buyer.name.label("buyer_name"),
+                    BuyerItem.item_id,
+                    BuyerItem.item_name,
+                    BuyerItem.quantity_needed,
+                    BuyerItem.min_price_per_unit,
+                    BuyerItem.max_price_per_unit
+                )
+                .join(SessionModel, SessionModel.id == NegotiationRun.session_id)
+                .join(BuyerItem, BuyerItem.id == NegotiationRun.buyer_item_id)
+                .join(Buyer, Buyer.id == BuyerItem.buyer_id)
+                .where(NegotiationRun.id == room_id)
+            ).first()
             if not run:
                 return {"error": "Run not found"}
             
             if run.status != 'pending':
                 # Allow restarting completed/aborted negotiations
-                if run.status in ['completed', 'aborted']:
+                if run.status in _RESTARTABLE_STATUSES:
                     logger.info(f"Restarting negotiation for room {room_id}")
-                    run.current_round = 0  # Reset round counter
-                    run.status = 'pending'
                 else:
                     return {"error": f"Run already {run.status}"}
             
-            # Update status
-            run.status = 'active'
-            run.started_at = datetime.now()
-            run.current_round = 0  # Always reset to 0 when starting
-            db.commit()
+            # Update status; the round counter always resets to 0 when starting.
+            # Conditional on the status just read, so of two concurrent starts
+            # only one claims the run and builds its room state
+            started_at = datetime.now()
+            claimed = db.execute(
+                update(NegotiationRun)
+                .where(NegotiationRun.id == room_id, NegotiationRun.status == run.status)
+                .values(status='active', started_at=started_at, current_round=0)
+            ).rowcount
+            if not claimed:
+                db.rollback()
+                return {"error": "Run already active"}
             
             # Create NegotiationRoomState for in-memory cache
-            # This would be populated from DB models
-            # For now, we'll create a placeholder
-            room_state = self._create_room_state_from_run(db, run)
+            room_state = self._create_room_state_from_run(db, room_id, run)
+            db.commit()
+            
             if room_state:
-                active_rooms[room_id] = (room_state, datetime.now())
+                active_rooms[room_id] = (room_state, started_at)
                 logger.info(f"Room {room_id} added to active_rooms (sellers: {len(room_state.sellers)})")
             else:
                 logger.error(f"Failed to create room state for {room_id} - room_state is None!")
@@ -364,48 +597,35 @@ class SessionManager:
             return {
                 "run_id": room_id,
                 "status": "active",
-                "started_at": run.started_at.isoformat()
+                "started_at": started_at.isoformat()
             }
     
-    def _create_room_state_from_run(self, db: Session, run: NegotiationRun) -> Optional[NegotiationRoomState]:
-        """Create NegotiationRoomState from DB run."""
-        logger.info(f"Creating room state from run {run.id}")
-        
-        # Get session to retrieve LLM provider
-        session = db.query(SessionModel).filter(SessionModel.id == run.session_id).first()
-        if not session:
-            logger.error(f"Session {run.session_id} not found for run {run.id}")
-            return None
-        
-        buyer_item = db.query(BuyerItem).filter(BuyerItem.id == run.buyer_item_id).first()
-        if not buyer_item:
-            logger.error(f"Buyer item {run.buyer_item_id} not found for run {run.id}")
-            return None
-        
-        buyer = db.query(Buyer).filter(Buyer.id == buyer_item.buyer_id).first()
-        if not buyer:
-            logger.error(f"Buyer {buyer_item.buyer_id} not found")
-            return None
-        
-        # Get participants
-        participants = db.query(NegotiationParticipant).filter(
-            NegotiationParticipant.negotiation_run_id == run.id
-        ).all()
+    def _create_room_state_from_run(self, db: Session, run_id: str, run: Row) -> Optional[NegotiationRoomState]:
+        """
+        Create NegotiationRoomState for a run being started.
         
-        logger.info(f"Found {len(participants)} participants for run {run.id}")
+        Args:
+            db: Database session
+            run_id: Negotiation run ID
+            run: Row of run, session, buyer and buyer item columns from start_negotiation
+        """
+        logger.info(f"Creating room state from run {run_id}")
         
-        seller_ids = [p.seller_id for p in participants]
-        sellers_orm = db.query(Seller).filter(Seller.id.in_(seller_ids)).all()
+        # Participating sellers via the participants table, with every seller's
+        # inventory loaded in one SELECT ... IN instead of one query per seller
+        sellers_orm = (
+            db.query(Seller)
+            .join(NegotiationParticipant, NegotiationParticipant.seller_id == Seller.id)
+            .options(selectinload(Seller.inventory))
+            .filter(NegotiationParticipant.negotiation_run_id == run_id)
+            .all()
+        )
         
         logger.info(f"Loaded {len(sellers_orm)} sellers from DB")
         
         # Convert to Seller models
         sellers = []
         for seller_orm in sellers_orm:
-            inventory_orm = db.query(SellerInventory).filter(
-                SellerInventory.seller_id == seller_orm.id
-            ).all()
-            
             inventory = [
                 InventoryItem(
                     item_id=inv.item_id,
@@ -415,7 +635,7 @@ class SessionManager:
                     least_price=inv.least_price,
                     quantity_available=inv.quantity_available
                 )
-                for inv in inventory_orm
+                for inv in seller_orm.inventory
             ]
             
             sellers.append(SellerModel(
@@ -429,28 +649,28 @@ class SessionManager:
             ))
         
         buyer_constraints = BuyerConstraints(
-            item_id=buyer_item.item_id,
-            item_name=buyer_item.item_name,
-            quantity_needed=buyer_item.quantity_needed,
-            min_price_per_unit=buyer_item.min_price_per_unit,
-            max_price_per_unit=buyer_item.max_price_per_unit
+            item_id=run.item_id,
+            item_name=run.item_name,
+            quantity_needed=run.quantity_needed,
+            min_price_per_unit=run.min_price_per_unit,
+            max_price_per_unit=run.max_price_per_unit
         )
         
         room_state = NegotiationRoomState(
-            room_id=run.id,
-            buyer_id=buyer.id,
-            buyer_name=buyer.name,
+            room_id=run_id,
+            buyer_id=run.buyer_id,
+            buyer_name=run.buyer_name,
             buyer_constraints=buyer_constraints,
             sellers=sellers,
             conversation_history=[],
-            current_round=run.current_round,  # Use DB value (should be 0 after reset)
+            current_round=0,  # Matches the reset written by start_negotiation
             max_rounds=run.max_rounds,
             status='active',
-            llm_provider=session.llm_provider,  # Use provider from session
-            llm_model=session.llm_model  # Use model from session
+            llm_provider=run.llm_provider,  # Use provider from session
+            llm_model=run.llm_model  # Use model from session
         )
         
-        logger.info(f"Successfully created room state for {run.id}: {len(sellers)} sellers, round {run.current_round}/{run.max_rounds}")
+        logger.info(f"Successfully created room state for {run_id}: {len(sellers)} sellers, round 0/{run.max_rounds}")
         return room_state
     
     def record_message(
@@ -487,7 +707,7 @@ class SessionManager:
                 sender_id=sender_id,
                 sender_name=sender_name,
                 message_text=message_text,
-                mentioned_agents=json.dumps(mentioned_agents) if mentioned_agents else None
+                mentioned_agents=mentioned_agents
             )
             db.add(message)
             db.commit()
@@ -535,7 +755,8 @@ class SessionManager:
         final_price_per_unit: Optional[float] = None,
         quantity: Optional[int] = None,
         decision_reason: Optional[str] = None,
-        emit_event: bool = False
+        emit_event: bool = False,
+        messages: Optional[List[dict]] = None
     ) -> NegotiationOutcome:
         """
         Finalize a negotiation run with outcome.
@@ -548,6 +769,8 @@ class SessionManager:
             quantity: Quantity (if deal)
             decision_reason: Decision reason
             emit_event: If True, emit decision event to active room state (for forced decisions)
+            messages: Conversation history from the room state, saved in the same
+                transaction (streamed turns are only kept in memory until now)
         
         Returns:
             NegotiationOutcome ORM object
@@ -568,7 +791,7 @@ class SessionManager:
             run.status = 'completed'
             run.ended_at = datetime.now()
             
-            # Compute total cost
+            # Total cost for the decision message (the outcome row computes its own)
             total_cost = None
             if final_price_per_unit and quantity:
                 total_cost = final_price_per_unit * quantity
@@ -581,15 +804,12 @@ class SessionManager:
                 selected_seller_id=selected_seller_id,
                 final_price_per_unit=final_price_per_unit,
                 quantity=quantity,
-                total_cost=total_cost,
                 decision_reason=decision_reason
             )
             db.add(outcome)
             
             # If room is active and emit_event is True, record decision message
             if emit_event and run_id in active_rooms:
-                room_state, _ = active_rooms[run_id]
-                
                 # Record system message about forced decision
                 if decision_type == "deal":
                     decision_message = f"🎯 Manual Decision: Accepted offer from {seller_name or selected_seller_id} at ${final_price_per_unit}/unit for {quantity} units (Total: ${total_cost}). Reason: {decision_reason or 'Manual override'}"
@@ -604,136 +824,222 @@ class SessionManager:
                     sender_type="buyer",
                     sender_id="system",
                     sender_name="System",
-                    message_text=decision_message,
-                    mentioned_agents=None
+                    message_text=decision_message
                 )
                 db.add(system_message)
             
+            # The whole streamed conversation in one batch, not a statement per turn
+            if messages:
+                bulk_insert_messages(db, [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "negotiation_run_id": run_id,
+                        "turn_number": msg["turn_number"],
+                        "sender_type": msg["sender_type"],
+                        "sender_id": msg["sender_id"],
+                        "sender_name": msg["sender_name"],
+                        "message_text": msg["content"],
+                        "timestamp": msg["timestamp"],
+                        "mentioned_agents": msg.get("mentioned_sellers")
+                    }
+                    for msg in messages
+                ])
+            
             db.commit()
             
-            # Write JSON log
-            if settings.AUTO_SAVE_NEGOTIATIONS:
-                self._write_json_log(db, run_id)
+            # Copy the log's rows out now; the JSON is built once the
+            # connection has gone back to the pool
+            log_rows = self._load_log_rows(db, run_id) if settings.AUTO_SAVE_NEGOTIATIONS else None
             
             # Remove from cache
-            if run_id in active_rooms:
-                del active_rooms[run_id]
-            
-            logger.info(f"Finalized run {run_id} with decision: {decision_type}")
-            return outcome
+            active_rooms.pop(run_id, None)
+        
+        if log_rows is not None:
+            self._write_json_log(run_id, log_rows)
+        
+        logger.info(f"Finalized run {run_id} with decision: {decision_type}")
+        return outcome
     
-    def _write_json_log(self, db: Session, run_id: str):
-        """Write JSON log for a negotiation run."""
+    def _load_log_rows(self, db: Session, run_id: str) -> Optional[dict]:
+        """
+        Read everything a run's JSON log needs as plain Python values.
+        
+        WHAT: Runs the log queries and copies the columns out of the ORM rows
+        WHY: The JSON structure can then be built after the session is closed,
+             so finalize_run hands its pooled connection back sooner
+        HOW: Returns tuples/dicts of primitives only; None if the run is gone
+        """
         run = db.query(NegotiationRun).filter(NegotiationRun.id == run_id).first()
         if not run:
-            return
+            return None
         
-        # Get all data for log
-        buyer_item = db.query(BuyerItem).filter(BuyerItem.id == run.buyer_item_id).first()
-        buyer = db.query(Buyer).filter(Buyer.id == buyer_item.buyer_id).first() if buyer_item else None
-        session = db.query(SessionModel).filter(SessionModel.id == run.session_id).first()
+        # Buyer item and its buyer come back in one joined round trip; the
+        # session row is not needed since run.session_id names the log folder.
+        buyer_item, buyer = (
+            db.query(BuyerItem, Buyer)
+            .join(Buyer, Buyer.id == BuyerItem.buyer_id)
+            .filter(BuyerItem.id == run.buyer_item_id)
+            .first()
+        ) or (None, None)
         
-        messages = db.query(Message).filter(Message.negotiation_run_id == run_id).order_by(Message.turn_number).all()
-        offers = db.query(Offer).join(Message).filter(Message.negotiation_run_id == run_id).all()
-        outcome = db.query(NegotiationOutcome).filter(NegotiationOutcome.negotiation_run_id == run_id).first()
+        # Column selects come back as plain Rows: no ORM objects for long conversations
+        messages = db.execute(
+            select(
+                Message.id, Message.turn_number, Message.timestamp, Message.sender_type,
+                Message.sender_id, Message.sender_name, Message.message_text
+            )
+            .where(Message.negotiation_run_id == run_id)
+            .order_by(Message.turn_number)
+        ).all()
+        mentions: Dict[str, List[str]] = {}
+        for message_id, seller_id in db.execute(
+            select(MessageMention.message_id, MessageMention.seller_id)
+            .join(Message, Message.id == MessageMention.message_id)
+            .where(Message.negotiation_run_id == run_id)
+        ):
+            mentions.setdefault(message_id, []).append(seller_id)
+        offers = db.execute(
+            select(
+                Offer.id, Offer.message_id, Offer.seller_id, Offer.price_per_unit,
+                Offer.quantity, Offer.timestamp
+            )
+            .join(Message, Message.id == Offer.message_id)
+            .where(Message.negotiation_run_id == run_id)
+        ).all()
+        outcome = (
+            db.query(NegotiationOutcome)
+            .options(undefer_group("body"))
+            .filter(NegotiationOutcome.negotiation_run_id == run_id)
+            .first()
+        )
+        return {
+            "run": (run.session_id, run.created_at, run.started_at, run.ended_at, run.current_round),
+            "buyer": (buyer.id, buyer.name) if buyer else None,
+            "buyer_item": (
+                buyer_item.item_name,
+                buyer_item.quantity_needed,
+                buyer_item.min_price_per_unit,
+                buyer_item.max_price_per_unit
+            ) if buyer_item else None,
+            "messages": [(*msg, mentions.get(msg[0], [])) for msg in messages],
+            "offers": offers,
+            "outcome": (
+                outcome.decision_type,
+                outcome.selected_seller_id,
+                outcome.final_price_per_unit,
+                outcome.quantity,
+                outcome.total_cost,
+                outcome.decision_reason
+            ) if outcome else None,
+        }
+    
+    def _write_json_log(self, run_id: str, rows: dict):
+        """Build the JSON log from _load_log_rows output and queue it for writing."""
+        session_id, created_at, started_at, ended_at, current_round = rows["run"]
+        buyer = rows["buyer"]
+        buyer_item = rows["buyer_item"]
+        outcome = rows["outcome"]
         
         # Build log structure
         log_data = {
             "metadata": {
-                "session_id": run.session_id,
+                "session_id": session_id,
                 "run_id": run_id,
-                "created_at": run.created_at.isoformat() if run.created_at else None,
-                "started_at": run.started_at.isoformat() if run.started_at else None,
-                "ended_at": run.ended_at.isoformat() if run.ended_at else None
+                "created_at": created_at.isoformat() if created_at else None,
+                "started_at": started_at.isoformat() if started_at else None,
+                "ended_at": ended_at.isoformat() if ended_at else None
             },
             "buyer": {
-                "buyer_id": buyer.id if buyer else None,
-                "buyer_name": buyer.name if buyer else None,
-                "item_name": buyer_item.item_name if buyer_item else None,
-                "quantity_needed": buyer_item.quantity_needed if buyer_item else None,
-                "min_price": buyer_item.min_price_per_unit if buyer_item else None,
-                "max_price": buyer_item.max_price_per_unit if buyer_item else None
+                "buyer_id": buyer[0] if buyer else None,
+                "buyer_name": buyer[1] if buyer else None,
+                "item_name": buyer_item[0] if buyer_item else None,
+                "quantity_needed": buyer_item[1] if buyer_item else None,
+                "min_price": buyer_item[2] if buyer_item else None,
+                "max_price": buyer_item[3] if buyer_item else None
             },
             "sellers": [],  # Would populate from participants
             "conversation_history": [
                 {
-                    "message_id": msg.id,
-                    "turn_number": msg.turn_number,
-                    "timestamp": msg.timestamp.isoformat() if msg.timestamp else None,
-                    "sender_type": msg.sender_type,
-                    "sender_id": msg.sender_id,
-                    "sender_name": msg.sender_name,
-                    "content": msg.message_text,
-                    "mentioned_agents": json.loads(msg.mentioned_agents) if msg.mentioned_agents else []
+                    "message_id": message_id,
+                    "turn_number": turn_number,
+                    "timestamp": timestamp.isoformat() if timestamp else None,
+                    "sender_type": sender_type,
+                    "sender_id": sender_id,
+                    "sender_name": sender_name,
+                    "content": content,
+                    "mentioned_agents": mentioned_agents
                 }
-                for msg in messages
+                for (message_id, turn_number, timestamp, sender_type, sender_id,
+                     sender_name, content, mentioned_agents) in rows["messages"]
             ],
             "offers_over_time": [
                 {
-                    "offer_id": offer.id,
-                    "message_id": offer.message_id,
-                    "seller_id": offer.seller_id,
-                    "price_per_unit": offer.price_per_unit,
-                    "quantity": offer.quantity,
-                    "timestamp": offer.timestamp.isoformat() if offer.timestamp else None
+                    "offer_id": offer_id,
+                    "message_id": message_id,
+                    "seller_id": seller_id,
+                    "price_per_unit": price_per_unit,
+                    "quantity": quantity,
+                    "timestamp": timestamp.isoformat() if timestamp else None
                 }
-                for offer in offers
+                for (offer_id, message_id, seller_id, price_per_unit,
+                     quantity, timestamp) in rows["offers"]
             ],
             "decision": {
-                "decision_type": outcome.decision_type if outcome else None,
-                "selected_seller_id": outcome.selected_seller_id if outcome else None,
-                "final_price": outcome.final_price_per_unit if outcome else None,
-                "quantity": outcome.quantity if outcome else None,
-                "total_cost": outcome.total_cost if outcome else None,
-                "reason": outcome.decision_reason if outcome else None
+                "decision_type": outcome[0],
+                "selected_seller_id": outcome[1],
+                "final_price": outcome[2],
+                "quantity": outcome[3],
+                "total_cost": outcome[4],
+                "reason": outcome[5]
             } if outcome else None,
-            "duration": (run.ended_at - run.started_at).total_seconds() if run.started_at and run.ended_at else None,
-            "rounds": run.current_round
+            "duration": (ended_at - started_at).total_seconds() if started_at and ended_at else None,
+            "rounds": current_round
         }
         
-        # Write to file
-        log_dir = Path(settings.LOGS_DIR) / session.id / run_id
-        log_dir.mkdir(parents=True, exist_ok=True)
-        log_file = log_dir / f"{run_id}.json"
-        
-        with open(log_file, 'w') as f:
-            json.dump(log_data, f, indent=2)
-        
-        logger.info(f"Wrote JSON log to {log_file}")
+        # Hand the built log to the writer thread; the caller does no disk I/O
+        _log_writer.submit(self.log_path(session_id, run_id), log_data)
     
     @staticmethod
     def cleanup_old_logs():
-        """Clean up logs older than retention period."""
-        log_dir = Path(settings.LOGS_DIR)
-        if not log_dir.exists():
-            return
+        """
+        Clean up logs older than retention period.
         
-        cutoff_date = datetime.now() - timedelta(days=settings.LOG_RETENTION_DAYS)
+        Uses os.scandir so each entry's type and mtime come from the directory
+        read (one lstat per entry at most) instead of a Path object plus
+        separate is_dir()/stat() calls.
+        """
+        log_dir = settings.LOGS_DIR
+        cutoff_ts = (datetime.now() - timedelta(days=settings.LOG_RETENTION_DAYS)).timestamp()
         deleted_count = 0
         
-        for session_dir in log_dir.iterdir():
-            if not session_dir.is_dir():
-                continue
-            
-            # Check session directory modification time
-            session_mtime = datetime.fromtimestamp(session_dir.stat().st_mtime)
-            
-            if session_mtime < cutoff_date:
-                # Delete entire session directory
-                import shutil
-                shutil.rmtree(session_dir)
-                deleted_count += 1
-                logger.info(f"Deleted old log directory: {session_dir}")
-            else:
+        try:
+            session_entries = os.scandir(log_dir)
+        except FileNotFoundError:
+            return
+        
+        with session_entries:
+            for session_entry in session_entries:
+                if not session_entry.is_dir(follow_symlinks=False):
+                    continue
+                
+                # Check session directory modification time
+                if session_entry.stat(follow_symlinks=False).st_mtime < cutoff_ts:
+                    # Delete entire session directory
+                    shutil.rmtree(session_entry.path)
+                    deleted_count += 1
+                    logger.info(f"Deleted old log directory: {session_entry.path}")
+                    continue
+                
                 # Check individual run directories
-                for run_dir in session_dir.iterdir():
-                    if run_dir.is_dir():
-                        run_mtime = datetime.fromtimestamp(run_dir.stat().st_mtime)
-                        if run_mtime < cutoff_date:
-                            import shutil
-                            shutil.rmtree(run_dir)
+                with os.scandir(session_entry.path) as run_entries:
+                    for run_entry in run_entries:
+                        if (
+                            run_entry.is_dir(follow_symlinks=False)
+                            and run_entry.stat(follow_symlinks=False).st_mtime < cutoff_ts
+                        ):
+                            shutil.rmtree(run_entry.path)
                             deleted_count += 1
-                            logger.info(f"Deleted old log directory: {run_dir}")
+                            logger.info(f"Deleted old log directory: {run_entry.path}")
         
         if deleted_count > 0:
             logger.info(f"Cleaned up {deleted_count} old log directories")
@@ -752,10 +1058,9 @@ class SessionManager:
         Returns:
             NegotiationRoomState if found, None otherwise
         """
-        if room_id in active_rooms:
-            room_state, _ = active_rooms[room_id]
-            return room_state
-        return None
+        # Single lookup: a cleanup sweep may drop the room between a check and a read
+        entry = active_rooms.get(room_id)
+        return entry[0] if entry is not None else None
     
     def build_state_response(self, room_id: str, agent_id: Optional[str] = None, agent_type: Optional[str] = None) -> Optional[Dict]:
         """
@@ -783,7 +1088,7 @@ class SessionManager:
                 return None
             
             # Get messages
-            messages_query = db.query(Message).filter(
+            messages_query = db.query(Message).options(selectinload(Message.mentions)).filter(
                 Message.negotiation_run_id == room_id
             ).order_by(Message.turn_number)
             
@@ -813,7 +1118,7 @@ class SessionManager:
                     "sender_id": msg.sender_id,
                     "sender_name": msg.sender_name,
                     "content": msg.message_text,
-                    "mentioned_agents": json.loads(msg.mentioned_agents) if msg.mentioned_agents else []
+                    "mentioned_agents": msg.mentioned_agents
                 }
                 conversation_history.append(conv_entry)
             
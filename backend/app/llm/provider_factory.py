@@ -29,19 +29,19 @@ def get_provider(provider_name: str | None = None) -> "LLMProvider":
     Raises:
         ValueError: If provider name is unknown
     """
-    # Import here to avoid circular dependencies
-    from ..core.config import settings
-    from ..utils.logger import get_logger
-    
-    logger = get_logger(__name__)
-    
     # Use default provider if not specified
     if provider_name is None:
+        # Import here to avoid circular dependencies
+        from ..core.config import settings
         provider_name = settings.LLM_PROVIDER
     
-    # Return cached instance if available
-    if provider_name in _provider_cache:
-        return _provider_cache[provider_name]
+    # Return cached instance if available (single dict lookup on the hot path)
+    provider = _provider_cache.get(provider_name)
+    if provider is not None:
+        return provider
+    
+    from ..utils.logger import get_logger
+    logger = get_logger(__name__)
     
     # Create new provider instance
     if provider_name == "lm_studio":
@@ -12,7 +12,7 @@ from contextlib import asynccontextmanager
 
 from .core.config import settings
 from .core.database import init_db, close_db
-from .core.session_manager import SessionManager
+from .core.session_manager import SessionManager, session_manager
 from .utils.logger import setup_logging, get_logger
 from .middleware.error_handler import register_exception_handlers
 from .api.v1.router import api_router
@@ -35,12 +35,14 @@ async def lifespan(app: FastAPI):
     logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
     init_db()  # Sync init_db for Phase 3
     SessionManager.cleanup_old_logs()  # Clean up old logs on startup
+    session_manager.start_cleanup()  # Periodic room TTL and log retention sweeps
     logger.info("Application startup complete")
     
     yield
     
     # Shutdown
     logger.info("Shutting down application")
+    session_manager.shutdown()
     close_db()  # Sync close_db for Phase 3
     logger.info("Application shutdown complete")
 
@@ -55,7 +57,7 @@ app = FastAPI(
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.get_cors_origins_list(),
+    allow_origins=list(settings.CORS_ORIGINS),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
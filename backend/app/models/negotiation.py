@@ -8,7 +8,6 @@ HOW: TypedDict for events, dataclass for room state
 
 from typing import TypedDict, Literal, Optional
 from dataclasses import dataclass, field
-from datetime import datetime
 
 from .agent import BuyerConstraints, Seller
 from .message import Message
@@ -18,12 +17,18 @@ class NegotiationEvent(TypedDict, total=False):
     """Event emitted during negotiation."""
     type: Literal["buyer_message", "seller_response", "negotiation_complete", "error", "heartbeat"]
     data: dict
-    timestamp: datetime
+    timestamp: str  # ISO 8601
 
 
-@dataclass
+@dataclass(slots=True)
 class NegotiationRoomState:
-    """In-memory state for a negotiation room."""
+    """
+    In-memory state for a negotiation room.
+    
+    Slotted: one instance lives per active room for the whole negotiation, so
+    dropping the per-instance __dict__ trims every cached room and speeds up
+    the attribute reads agents make each turn.
+    """
     room_id: str
     buyer_id: str
     buyer_name: str
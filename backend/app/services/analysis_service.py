@@ -7,7 +7,7 @@ HOW: Use LLM to analyze conversation history and outcomes
 """
 
 from typing import Optional, Dict
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 
 from ..core.models import (
     NegotiationRun, NegotiationOutcome, Message, Buyer, BuyerItem, Seller
@@ -85,7 +85,7 @@ async def analyze_negotiation_run(
             })
         
         # Get outcome
-        outcome_record = db.query(NegotiationOutcome).filter(
+        outcome_record = db.query(NegotiationOutcome).options(undefer_group("body")).filter(
             NegotiationOutcome.negotiation_run_id == run_id
         ).first()
         
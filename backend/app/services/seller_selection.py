@@ -6,7 +6,7 @@ WHY: Determine which sellers can participate in a negotiation
 HOW: Match buyer item against seller inventory, check price overlap and quantity
 """
 
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from ..core.models import Seller, SellerInventory, BuyerItem
 from ..models.agent import Seller as SellerModel, InventoryItem
 from ..utils.logger import get_logger
@@ -14,10 +14,36 @@ from ..utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+def index_inventories(
+    seller_inventories: List[List[SellerInventory]]
+) -> List[Dict[str, SellerInventory]]:
+    """
+    Key each seller's inventory by normalized item name.
+    
+    Build once per session and pass to select_sellers_for_item so each
+    buyer item is matched with a dict lookup instead of a scan of every
+    seller's inventory. The first entry wins on duplicate names, as in a scan.
+    
+    Args:
+        seller_inventories: List of inventory lists, one per seller
+    
+    Returns:
+        List of {item_name.lower().strip(): SellerInventory}, same order
+    """
+    indexes = []
+    for inventory_list in seller_inventories:
+        index: Dict[str, SellerInventory] = {}
+        for inv in inventory_list:
+            index.setdefault(inv.item_name.lower().strip(), inv)
+        indexes.append(index)
+    return indexes
+
+
 def select_sellers_for_item(
     buyer_item: BuyerItem,
     sellers: List[Seller],
-    seller_inventories: List[List[SellerInventory]]
+    seller_inventories: List[List[SellerInventory]],
+    inventory_indexes: Optional[List[Dict[str, SellerInventory]]] = None
 ) -> Tuple[List[Seller], List[dict]]:
     """
     Select sellers who can participate in negotiation for a buyer item.
@@ -30,6 +56,8 @@ def select_sellers_for_item(
         buyer_item: BuyerItem from database
         sellers: List of Seller ORM models
         seller_inventories: List of inventory lists, one per seller (same order as sellers)
+        inventory_indexes: Optional index_inventories(seller_inventories) result,
+            reused across buyer items; built here when omitted
     
     Returns:
         Tuple of (participating_sellers, skipped_reasons)
@@ -39,13 +67,13 @@ def select_sellers_for_item(
     participating_sellers = []
     skipped_reasons = []
     
-    for seller, inventory_list in zip(sellers, seller_inventories):
+    if inventory_indexes is None:
+        inventory_indexes = index_inventories(seller_inventories)
+    item_key = buyer_item.item_name.lower().strip()
+    
+    for seller, inventory_index in zip(sellers, inventory_indexes):
         # Find matching inventory item by item_name (case-insensitive)
-        matching_inventory = None
-        for inv in inventory_list:
-            if inv.item_name.lower().strip() == buyer_item.item_name.lower().strip():
-                matching_inventory = inv
-                break
+        matching_inventory = inventory_index.get(item_key)
         
         if not matching_inventory:
             skipped_reasons.append({
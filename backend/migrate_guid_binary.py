@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Database migration script: Convert UUID keys from text to 16-byte binary.
+
+WHAT: Rewrites every ID / foreign-key column from 36-char text to the GUID
+      column type's 16-byte form
+WHY: Databases created before the GUID type store IDs as text; lookups bind
+     16 bytes and would silently match nothing
+HOW: One transaction of UPDATEs converting text values in place; rows that
+     are already binary are left alone, so re-running is a no-op
+
+Only values change: no table is rebuilt. Old tables keep timestamp columns
+without a SQL DEFAULT, which is fine because the models put now() in every
+INSERT. Run migrate_message_mentions.py and migrate_outcome_total_cost.py for
+the other schema changes.
+
+Usage:
+    python migrate_guid_binary.py
+"""
+
+import sqlite3
+import sys
+import uuid
+from pathlib import Path
+
+# Database path (relative to backend directory)
+DB_PATH = Path(__file__).parent / "data" / "marketplace.db"
+
+# Every GUID column, per table (mirrors app/core/models.py)
+GUID_COLUMNS = {
+    "sessions": ["id"],
+    "buyers": ["id", "session_id"],
+    "sellers": ["id", "session_id"],
+    "buyer_items": ["id", "buyer_id"],
+    "seller_inventory": ["id", "seller_id"],
+    "negotiation_runs": ["id", "session_id", "buyer_item_id"],
+    "negotiation_participants": ["id", "negotiation_run_id", "seller_id"],
+    "messages": ["id", "negotiation_run_id"],
+    "message_mentions": ["message_id", "seller_id"],
+    "offers": ["id", "message_id", "seller_id"],
+    "negotiation_outcomes": ["id", "negotiation_run_id", "selected_seller_id"],
+}
+
+
+def uuid_bytes(value):
+    """SQLite function: 36-char UUID text -> 16 bytes (raises on malformed IDs)."""
+    return uuid.UUID(value).bytes
+
+
+def migrate():
+    """Convert text UUID columns to 16-byte binary."""
+
+    if not DB_PATH.exists():
+        print(f"[OK] Database does not exist yet at {DB_PATH}")
+        print("   No migration needed - new databases use binary IDs.")
+        return
+
+    print(f"[*] Migrating database: {DB_PATH}")
+
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        conn.create_function("uuid_bytes", 1, uuid_bytes, deterministic=True)
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        tables = {row[0] for row in cursor.fetchall()}
+
+        # Refuse to convert anything if a single ID is not a UUID
+        bad = []
+        for table, columns in GUID_COLUMNS.items():
+            if table not in tables:
+                continue
+            for column in columns:
+                cursor.execute(
+                    f"SELECT {column} FROM {table} WHERE typeof({column}) = 'text'"
+                )
+                for (value,) in cursor.fetchall():
+                    try:
+                        uuid.UUID(value)
+                    except ValueError:
+                        bad.append(f"{table}.{column} = {value!r}")
+        if bad:
+            print("[ERROR] Found IDs that are not UUIDs; nothing was changed:")
+            for entry in bad[:20]:
+                print(f"   {entry}")
+            conn.close()
+            sys.exit(1)
+
+        # Parents and children change together, so FK checks stay off until commit
+        cursor.execute("PRAGMA foreign_keys=OFF")
+        converted = 0
+        for table, columns in GUID_COLUMNS.items():
+            if table not in tables:
+                print(f"[-] Table '{table}' not present, skipping")
+                continue
+            for column in columns:
+                cursor.execute(
+                    f"UPDATE {table} SET {column} = uuid_bytes({column}) "
+                    f"WHERE typeof({column}) = 'text'"
+                )
+                if cursor.rowcount:
+                    print(f"[+] {table}.{column}: converted {cursor.rowcount} rows")
+                converted += cursor.rowcount
+
+        conn.commit()
+
+        if converted == 0:
+            print("[OK] All IDs are already binary.")
+            print("   No migration needed.")
+        else:
+            print("[OK] Migration completed successfully!")
+            print(f"   Converted {converted} ID values to 16-byte binary")
+
+        # Verify the change
+        cursor.execute("PRAGMA foreign_key_check")
+        violations = cursor.fetchall()
+        if violations:
+            print(f"[!] Warning: {len(violations)} foreign key violations after migration")
+        else:
+            print("[OK] Verified: foreign keys are consistent")
+
+        conn.close()
+
+    except sqlite3.Error as e:
+        print(f"[ERROR] Migration failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Database Migration: Binary UUID Keys")
+    print("=" * 60)
+    migrate()
+    print("=" * 60)
+    print("\n[SUCCESS] Migration script completed!")
+    print("\nNext steps:")
+    print("  1. Run migrate_message_mentions.py and migrate_outcome_total_cost.py")
+    print("  2. Start the backend: python -m app.main")
+    print("  3. Existing sessions and logs keep their IDs")
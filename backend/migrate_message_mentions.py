@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Database migration script: Backfill message_mentions from messages.mentioned_agents.
+
+WHAT: Creates the message_mentions table and copies each message's JSON
+      mentioned_agents list into it
+WHY: Mentions moved from a JSON column on messages to their own table;
+     without a backfill, mentions in existing databases are lost
+HOW: CREATE TABLE (with FKs to messages and sellers), then INSERT OR IGNORE
+     one row per mentioned seller; re-running is a no-op
+
+The old mentioned_agents column is left in place (nothing reads it any more),
+so the migration never destroys data.
+
+Usage:
+    python migrate_message_mentions.py
+"""
+
+import json
+import sqlite3
+import sys
+import uuid
+from pathlib import Path
+
+# Database path (relative to backend directory)
+DB_PATH = Path(__file__).parent / "data" / "marketplace.db"
+
+CREATE_MENTIONS = """
+    CREATE TABLE message_mentions (
+        message_id BINARY(16) NOT NULL,
+        seller_id BINARY(16) NOT NULL,
+        PRIMARY KEY (message_id, seller_id),
+        FOREIGN KEY(message_id) REFERENCES messages (id) ON DELETE CASCADE,
+        FOREIGN KEY(seller_id) REFERENCES sellers (id) ON DELETE CASCADE
+    )
+"""
+CREATE_MENTIONS_INDEX = "CREATE INDEX IF NOT EXISTS idx_mentions_seller ON message_mentions (seller_id)"
+
+
+def stored_seller_ids(cursor):
+    """Map every form a seller ID may be written in (text or bytes) to its stored value."""
+    forms = {}
+    cursor.execute("SELECT id FROM sellers")
+    for (stored,) in cursor.fetchall():
+        key = uuid.UUID(bytes=stored) if isinstance(stored, bytes) else uuid.UUID(stored)
+        forms[key] = stored
+    return forms
+
+
+def migrate():
+    """Create message_mentions and backfill it from messages.mentioned_agents."""
+
+    if not DB_PATH.exists():
+        print(f"[OK] Database does not exist yet at {DB_PATH}")
+        print("   No migration needed - the table will be created automatically.")
+        return
+
+    print(f"[*] Migrating database: {DB_PATH}")
+
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+        cursor.execute("PRAGMA foreign_keys=OFF")
+
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'message_mentions'")
+        if not cursor.fetchone():
+            print("[+] Creating 'message_mentions' table...")
+            cursor.execute(CREATE_MENTIONS)
+        else:
+            # Tables created before the seller FK existed are rebuilt with it
+            cursor.execute("PRAGMA foreign_key_list(message_mentions)")
+            if "sellers" not in {row[2] for row in cursor.fetchall()}:
+                print("[+] Rebuilding 'message_mentions' with a foreign key to sellers...")
+                cursor.execute("DROP INDEX IF EXISTS idx_mentions_seller")
+                cursor.execute("ALTER TABLE message_mentions RENAME TO message_mentions_old")
+                cursor.execute(CREATE_MENTIONS)
+                cursor.execute("""
+                    INSERT OR IGNORE INTO message_mentions (message_id, seller_id)
+                    SELECT message_id, seller_id FROM message_mentions_old
+                    WHERE seller_id IN (SELECT id FROM sellers)
+                """)
+                cursor.execute("DROP TABLE message_mentions_old")
+        cursor.execute(CREATE_MENTIONS_INDEX)
+
+        cursor.execute("PRAGMA table_info(messages)")
+        columns = [row[1] for row in cursor.fetchall()]
+        if "mentioned_agents" not in columns:
+            conn.commit()
+            print("[OK] messages has no 'mentioned_agents' column; nothing to backfill.")
+            conn.close()
+            return
+
+        sellers = stored_seller_ids(cursor)
+        cursor.execute(
+            "SELECT id, mentioned_agents FROM messages "
+            "WHERE mentioned_agents IS NOT NULL AND mentioned_agents NOT IN ('', '[]', 'null')"
+        )
+        rows = []
+        skipped = 0
+        for message_id, raw in cursor.fetchall():
+            try:
+                seller_ids = json.loads(raw) or []
+            except ValueError:
+                skipped += 1
+                continue
+            for seller_id in seller_ids:
+                try:
+                    stored = sellers.get(uuid.UUID(str(seller_id)))
+                except ValueError:
+                    stored = None
+                if stored is None:
+                    # Not a seller row: the FK would reject it
+                    skipped += 1
+                    continue
+                rows.append((message_id, stored))
+
+        print(f"[+] Backfilling {len(rows)} mentions...")
+        cursor.executemany(
+            "INSERT OR IGNORE INTO message_mentions (message_id, seller_id) VALUES (?, ?)", rows
+        )
+        conn.commit()
+
+        print("[OK] Migration completed successfully!")
+        print(f"   Copied {cursor.rowcount if cursor.rowcount >= 0 else len(rows)} mentions")
+        if skipped:
+            print(f"[!] Skipped {skipped} mentions that were unreadable or not seller IDs")
+
+        # Verify the change
+        cursor.execute("PRAGMA foreign_key_check(message_mentions)")
+        if cursor.fetchall():
+            print("[!] Warning: message_mentions has foreign key violations")
+        else:
+            print("[OK] Verified: every mention points at an existing message and seller")
+
+        conn.close()
+
+    except sqlite3.Error as e:
+        print(f"[ERROR] Migration failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Database Migration: Backfill Message Mentions")
+    print("=" * 60)
+    migrate()
+    print("=" * 60)
+    print("\n[SUCCESS] Migration script completed!")
+    print("\nNext steps:")
+    print("  1. Run migrate_guid_binary.py if you have not already")
+    print("  2. Start the backend: python -m app.main")
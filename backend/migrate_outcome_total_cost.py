@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Database migration script: Make negotiation_outcomes.total_cost a generated column.
+
+WHAT: Rebuilds negotiation_outcomes so total_cost is
+      GENERATED ALWAYS AS (final_price_per_unit * quantity) STORED
+WHY: The ORM no longer writes total_cost; on tables created before the
+     generated column, new outcomes would store NULL
+HOW: SQLite cannot turn an existing column into a generated one, so create
+     the new table, copy every other column across, drop the old table and
+     rename; the database recomputes total_cost for existing rows too
+
+Usage:
+    python migrate_outcome_total_cost.py
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+# Database path (relative to backend directory)
+DB_PATH = Path(__file__).parent / "data" / "marketplace.db"
+
+# Mirrors NegotiationOutcome in app/core/models.py
+CREATE_OUTCOMES = """
+    CREATE TABLE negotiation_outcomes_new (
+        id BINARY(16) NOT NULL,
+        negotiation_run_id BINARY(16) NOT NULL,
+        decision_type VARCHAR(20) NOT NULL CHECK (decision_type IN ('deal', 'no_deal')),
+        selected_seller_id BINARY(16),
+        final_price_per_unit FLOAT,
+        quantity INTEGER,
+        total_cost FLOAT GENERATED ALWAYS AS (final_price_per_unit * quantity) STORED,
+        decision_reason TEXT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        PRIMARY KEY (id),
+        UNIQUE (negotiation_run_id),
+        FOREIGN KEY(negotiation_run_id) REFERENCES negotiation_runs (id) ON DELETE CASCADE,
+        FOREIGN KEY(selected_seller_id) REFERENCES sellers (id)
+    )
+"""
+COPIED_COLUMNS = (
+    "id, negotiation_run_id, decision_type, selected_seller_id, "
+    "final_price_per_unit, quantity, decision_reason, timestamp"
+)
+
+# PRAGMA table_xinfo "hidden" value for a STORED generated column
+STORED_GENERATED = 3
+
+
+def migrate():
+    """Rebuild negotiation_outcomes with a generated total_cost column."""
+
+    if not DB_PATH.exists():
+        print(f"[OK] Database does not exist yet at {DB_PATH}")
+        print("   No migration needed - the table will be created automatically.")
+        return
+
+    print(f"[*] Migrating database: {DB_PATH}")
+
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+
+        cursor.execute("PRAGMA table_xinfo(negotiation_outcomes)")
+        hidden = {row[1]: row[6] for row in cursor.fetchall()}
+        if not hidden:
+            print("[OK] Table 'negotiation_outcomes' not present.")
+            print("   No migration needed - the table will be created automatically.")
+            conn.close()
+            return
+        if hidden.get("total_cost") == STORED_GENERATED:
+            print("[OK] Column 'total_cost' is already generated.")
+            print("   No migration needed.")
+            conn.close()
+            return
+
+        # The table is dropped and renamed, so FK enforcement stays off until the swap is done
+        cursor.execute("PRAGMA foreign_keys=OFF")
+        cursor.execute("BEGIN")
+        print("[+] Rebuilding 'negotiation_outcomes' with a generated 'total_cost'...")
+        cursor.execute("DROP TABLE IF EXISTS negotiation_outcomes_new")
+        cursor.execute(CREATE_OUTCOMES)
+        cursor.execute(
+            f"INSERT INTO negotiation_outcomes_new ({COPIED_COLUMNS}) "
+            f"SELECT {COPIED_COLUMNS} FROM negotiation_outcomes"
+        )
+        copied = cursor.rowcount
+        cursor.execute("DROP TABLE negotiation_outcomes")
+        cursor.execute("ALTER TABLE negotiation_outcomes_new RENAME TO negotiation_outcomes")
+        cursor.execute(
+            "CREATE INDEX idx_outcomes_negotiation ON negotiation_outcomes (negotiation_run_id)"
+        )
+        conn.commit()
+
+        print("[OK] Migration completed successfully!")
+        print(f"   Copied {copied} outcomes")
+
+        # Verify the change
+        cursor.execute("PRAGMA table_xinfo(negotiation_outcomes)")
+        hidden = {row[1]: row[6] for row in cursor.fetchall()}
+        cursor.execute("PRAGMA foreign_key_check(negotiation_outcomes)")
+        if hidden.get("total_cost") == STORED_GENERATED and not cursor.fetchall():
+            print("[OK] Verified: 'total_cost' is generated and foreign keys are consistent")
+        else:
+            print("[!] Warning: Could not verify the rebuilt table")
+
+        conn.close()
+
+    except sqlite3.Error as e:
+        print(f"[ERROR] Migration failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Database Migration: Generated Outcome Total Cost")
+    print("=" * 60)
+    migrate()
+    print("=" * 60)
+    print("\n[SUCCESS] Migration script completed!")
+    print("\nNext steps:")
+    print("  1. Start the backend: python -m app.main")
+    print("  2. Outcome totals are now computed by the database")
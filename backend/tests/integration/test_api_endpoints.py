@@ -7,6 +7,7 @@ HOW: FastAPI TestClient with mocked providers and database
 """
 
 import pytest
+import asyncio
 import json
 from fastapi.testclient import TestClient
 from unittest.mock import patch, AsyncMock, MagicMock
@@ -351,7 +352,7 @@ class TestStreamingEndpoint:
             yield {
                 "type": "negotiation_complete",
                 "data": {"room_id": room_id},
-                "timestamp": datetime.now()
+                "timestamp": datetime.now().isoformat()
             }
         
         mock_graph_instance = MagicMock()
@@ -364,6 +365,44 @@ class TestStreamingEndpoint:
             # Check that it's text/event-stream
             assert "text/event-stream" in response.headers.get("content-type", "")
 
+    @patch('app.api.v1.endpoints.streaming.get_provider')
+    @patch('app.api.v1.endpoints.streaming.NegotiationGraph')
+    def test_outcome_saved_before_complete_event(self, mock_graph, mock_provider, client, sample_initialize_request):
+        """Test the run is finalized by the time negotiation_complete arrives."""
+        init_response = client.post(
+            "/api/v1/simulation/initialize",
+            json=sample_initialize_request
+        )
+        room_id = init_response.json()["negotiation_rooms"][0]["room_id"]
+        client.post(f"/api/v1/negotiation/{room_id}/start")
+
+        async def mock_run(room_state):
+            yield {
+                "type": "negotiation_complete",
+                "data": {"room_id": room_id},
+                "timestamp": datetime.now().isoformat()
+            }
+
+        mock_graph_instance = MagicMock()
+        mock_graph_instance.run = mock_run
+        mock_graph.return_value = mock_graph_instance
+
+        from app.api.v1.endpoints.streaming import negotiation_event_generator
+
+        async def read_until_complete():
+            async for frame in negotiation_event_generator(room_id):
+                if frame.startswith(b"event: negotiation_complete"):
+                    # Checked while the stream is still open
+                    with get_db() as db:
+                        run = db.query(NegotiationRun).filter(NegotiationRun.id == room_id).first()
+                        outcome = db.query(NegotiationOutcome).filter(
+                            NegotiationOutcome.negotiation_run_id == room_id
+                        ).first()
+                        return run.status, outcome.decision_type if outcome else None
+            return None
+
+        assert asyncio.run(read_until_complete()) == ("completed", "no_deal")
+
 
 class TestLogsEndpoint:
     """Test logs retrieval endpoint."""
@@ -376,6 +415,31 @@ class TestLogsEndpoint:
         data = response.json()
         assert data["error"] in ["LOG_NOT_FOUND", "ROOM_NOT_FOUND"]
 
+    def test_get_log_waits_for_pending_write(self, client, sample_initialize_request):
+        """Test a log requested right after finalize_run is served, not a 404."""
+        import time
+        from app.core import session_manager as sm_module
+        from app.core.database import init_db
+
+        init_db()
+        init_response = client.post("/api/v1/simulation/initialize", json=sample_initialize_request)
+        session_id = init_response.json()["session_id"]
+        room_id = init_response.json()["negotiation_rooms"][0]["room_id"]
+        client.post(f"/api/v1/negotiation/{room_id}/start")
+
+        # Slow the writer thread down so the request lands while the write is queued
+        write_log_file = sm_module._write_log_file
+        def slow_write(log_file, log_data):
+            time.sleep(0.3)
+            write_log_file(log_file, log_data)
+
+        with patch.object(sm_module, "_write_log_file", slow_write):
+            sm_module.session_manager.finalize_run(run_id=room_id, decision_type="no_deal")
+            response = client.get(f"/api/v1/logs/{session_id}/{room_id}")
+
+        assert response.status_code == 200
+        assert response.json()["metadata"]["run_id"] == room_id
+
 
 class TestValidationErrors:
     """Test request validation errors."""
@@ -357,6 +357,25 @@ class TestCacheTTL:
         
         # Room should be removed (age >= TTL)
         assert run_id not in active_rooms, "Room at boundary should be removed"
+    
+    def test_cache_cleanup_skips_restamped_room(self, db_session, sample_request):
+        """Test that a room re-stamped after an old entry is not evicted by the stale one."""
+        manager = SessionManager()
+        
+        response = manager.create_session(sample_request)
+        room_id = response.negotiation_rooms[0].room_id
+        
+        run_id = manager.start_negotiation(room_id)["run_id"]
+        room_state = active_rooms[run_id][0]
+        
+        # Expired stamp first, then a fresh one for the same room
+        old_time = datetime.now() - timedelta(hours=settings.SESSION_CLEANUP_HOURS + 1)
+        active_rooms[run_id] = (room_state, old_time)
+        active_rooms[run_id] = (room_state, datetime.now())
+        
+        manager._cleanup_expired_rooms()
+        
+        assert run_id in active_rooms, "Re-stamped room should be retained"
 
 
 class TestCacheHitMiss:
@@ -407,3 +426,59 @@ class TestCacheHitMiss:
         # Cache miss
         assert run_id not in active_rooms, "Cache miss: room should not be in cache"
 
+
+
+class TestCleanupLoop:
+    """Test the background cleanup thread lifecycle."""
+    
+    def test_start_cleanup_is_idempotent_and_shutdown_stops(self):
+        """Repeated starts reuse one thread; shutdown ends it promptly."""
+        manager = SessionManager()
+        
+        manager.start_cleanup()
+        thread = manager._cleanup_thread
+        manager.start_cleanup()
+        assert manager._cleanup_thread is thread, "Second start should not spawn a thread"
+        assert thread.daemon
+        
+        manager.shutdown(timeout=5)
+        assert not thread.is_alive(), "Cleanup thread should exit on shutdown"
+    
+    def test_start_cleanup_respects_disable_flag(self, monkeypatch):
+        """ENABLE_BACKGROUND_CLEANUP=False keeps the manager thread-free."""
+        import app.core.session_manager as session_manager_module
+        
+        monkeypatch.setattr(
+            session_manager_module, "settings",
+            settings.model_copy(update={"ENABLE_BACKGROUND_CLEANUP": False})
+        )
+        manager = SessionManager()
+        
+        manager.start_cleanup()
+        
+        assert manager._cleanup_thread is None, "No thread should start when disabled"
+    
+    def test_concurrent_writes_and_sweeps_keep_cache_consistent(self):
+        """Writers racing the cleanup sweep never lose fresh rooms or corrupt the heap."""
+        import threading
+        
+        stale = datetime.now() - timedelta(hours=settings.SESSION_CLEANUP_HOURS + 1)
+        cutoff = datetime.now() - timedelta(hours=settings.SESSION_CLEANUP_HOURS)
+        
+        def writer(prefix):
+            for i in range(500):
+                room_id = f"{prefix}-{i}"
+                active_rooms[room_id] = (None, stale)
+                active_rooms[room_id] = (None, datetime.now())
+        
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        while any(thread.is_alive() for thread in threads):
+            active_rooms.pop_expired(cutoff)
+        for thread in threads:
+            thread.join()
+        active_rooms.pop_expired(cutoff)
+        
+        assert len(active_rooms) == 2000, "Re-stamped rooms must survive concurrent sweeps"
+        active_rooms.clear()
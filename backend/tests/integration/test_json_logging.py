@@ -140,6 +140,7 @@ class TestJSONLogging:
         )
         
         # Verify log file exists
+        manager.flush_logs()  # Logs are written by a background thread
         log_file = Path(settings.LOGS_DIR) / session_id / run_id / f"{run_id}.json"
         assert log_file.exists(), f"Log file not found at {log_file}"
     
@@ -193,6 +194,7 @@ class TestJSONLogging:
         )
         
         # Load and verify log
+        manager.flush_logs()  # Logs are written by a background thread
         log_file = Path(settings.LOGS_DIR) / session_id / run_id / f"{run_id}.json"
         with open(log_file, 'r') as f:
             log_data = json.load(f)
@@ -264,6 +266,7 @@ class TestJSONLogging:
         )
         
         # Verify log exists
+        manager.flush_logs()  # Logs are written by a background thread
         log_file = Path(settings.LOGS_DIR) / session_id / run_id / f"{run_id}.json"
         assert log_file.exists()
         
@@ -361,6 +364,7 @@ class TestJSONLogging:
         manager.finalize_run(run2_id, decision_type="no_deal")
         
         # Verify both logs exist
+        manager.flush_logs()  # Logs are written by a background thread
         log1 = Path(settings.LOGS_DIR) / session_id / run1_id / f"{run1_id}.json"
         log2 = Path(settings.LOGS_DIR) / session_id / run2_id / f"{run2_id}.json"
         
@@ -396,6 +400,7 @@ class TestJSONLogging:
         manager.finalize_run(run_id, decision_type="no_deal")
         
         # Verify log contains all messages
+        manager.flush_logs()  # Logs are written by a background thread
         log_file = Path(settings.LOGS_DIR) / response.session_id / run_id / f"{run_id}.json"
         with open(log_file, 'r') as f:
             log_data = json.load(f)
@@ -437,6 +442,7 @@ class TestJSONLogging:
         manager.finalize_run(run_id, decision_type="deal", selected_seller_id=seller_id, final_price_per_unit=1020.0, quantity=2)
         
         # Verify log contains all offers
+        manager.flush_logs()  # Logs are written by a background thread
         log_file = Path(settings.LOGS_DIR) / response.session_id / run_id / f"{run_id}.json"
         with open(log_file, 'r') as f:
             log_data = json.load(f)
@@ -471,6 +477,7 @@ class TestJSONLogging:
         )
         
         # Verify log
+        manager.flush_logs()  # Logs are written by a background thread
         log_file = Path(settings.LOGS_DIR) / response.session_id / run_id / f"{run_id}.json"
         with open(log_file, 'r') as f:
             log_data = json.load(f)
@@ -497,6 +504,7 @@ class TestJSONLogging:
         manager.finalize_run(run_id, decision_type="no_deal")
         
         # Verify log
+        manager.flush_logs()  # Logs are written by a background thread
         log_file = Path(settings.LOGS_DIR) / response.session_id / run_id / f"{run_id}.json"
         with open(log_file, 'r') as f:
             log_data = json.load(f)
@@ -298,6 +298,8 @@ class TestLogRetention:
             message_text="Hello"
         )
         manager.finalize_run(run_id, decision_type="no_deal")
+        # Logs are written by a background thread; wait for it
+        manager.flush_logs()
         
         # Verify log exists
         log_file = Path(settings.LOGS_DIR) / session_id / run_id / f"{run_id}.json"
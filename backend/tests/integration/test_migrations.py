@@ -0,0 +1,316 @@
+"""
+Migration integration tests for Phase 3.
+
+WHAT: Run the shipped migration scripts on a database with the original schema
+WHY: create_all never alters existing tables, so old databases only work if the
+     migrations plus the models' defaults cover every schema change
+HOW: Build the original tables with raw DDL, migrate, start the app's schema
+     setup, then create and finish a negotiation through SessionManager
+"""
+
+import pytest
+import sqlite3
+import uuid
+from pathlib import Path
+
+import migrate_guid_binary
+import migrate_message_mentions
+import migrate_outcome_total_cost
+from app.core.database import init_db, Base, engine
+from app.core.session_manager import SessionManager
+from app.models.api_schemas import InitializeSessionRequest, BuyerConfig, ShoppingItem, SellerConfig, InventoryItem, SellerProfile, LLMConfig
+
+
+# Tables as the original models created them: text IDs, JSON mentions,
+# a plain total_cost column and no SQL DEFAULT on any timestamp
+BASELINE_SCHEMA = """
+CREATE TABLE sessions (
+    id VARCHAR(36) NOT NULL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    status VARCHAR(20) NOT NULL CHECK (status IN ('draft', 'active', 'completed')),
+    llm_model VARCHAR(100) NOT NULL,
+    llm_temperature FLOAT NOT NULL,
+    llm_max_tokens INTEGER NOT NULL,
+    llm_provider VARCHAR(20) NOT NULL,
+    PRIMARY KEY (id)
+);
+CREATE INDEX idx_sessions_status ON sessions (status);
+CREATE TABLE buyers (
+    id VARCHAR(36) NOT NULL,
+    session_id VARCHAR(36) NOT NULL,
+    name VARCHAR(100) NOT NULL,
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY(session_id) REFERENCES sessions (id) ON DELETE CASCADE
+);
+CREATE INDEX idx_buyers_session ON buyers (session_id);
+CREATE TABLE sellers (
+    id VARCHAR(36) NOT NULL,
+    session_id VARCHAR(36) NOT NULL,
+    name VARCHAR(100) NOT NULL,
+    priority VARCHAR(20) NOT NULL CHECK (priority IN ('customer_retention', 'maximize_profit')),
+    speaking_style VARCHAR(20) NOT NULL CHECK (speaking_style IN ('rude', 'very_sweet')),
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY(session_id) REFERENCES sessions (id) ON DELETE CASCADE
+);
+CREATE INDEX idx_sellers_session ON sellers (session_id);
+CREATE TABLE buyer_items (
+    id VARCHAR(36) NOT NULL,
+    buyer_id VARCHAR(36) NOT NULL,
+    item_id VARCHAR(50) NOT NULL,
+    item_name VARCHAR(100) NOT NULL,
+    quantity_needed INTEGER NOT NULL CHECK (quantity_needed > 0),
+    min_price_per_unit FLOAT NOT NULL CHECK (min_price_per_unit >= 0),
+    max_price_per_unit FLOAT NOT NULL,
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    CHECK (max_price_per_unit > min_price_per_unit),
+    FOREIGN KEY(buyer_id) REFERENCES buyers (id) ON DELETE CASCADE
+);
+CREATE INDEX idx_buyer_items_buyer ON buyer_items (buyer_id);
+CREATE TABLE seller_inventory (
+    id VARCHAR(36) NOT NULL,
+    seller_id VARCHAR(36) NOT NULL,
+    item_id VARCHAR(50) NOT NULL,
+    item_name VARCHAR(100) NOT NULL,
+    cost_price FLOAT NOT NULL CHECK (cost_price >= 0),
+    selling_price FLOAT NOT NULL CHECK (selling_price > cost_price),
+    least_price FLOAT NOT NULL,
+    quantity_available INTEGER NOT NULL CHECK (quantity_available >= 0),
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    CHECK (least_price > cost_price AND least_price < selling_price),
+    CONSTRAINT uq_seller_inventory_item UNIQUE (seller_id, item_id),
+    FOREIGN KEY(seller_id) REFERENCES sellers (id) ON DELETE CASCADE
+);
+CREATE INDEX idx_seller_inventory_seller ON seller_inventory (seller_id);
+CREATE INDEX idx_seller_inventory_item ON seller_inventory (item_id);
+CREATE TABLE negotiation_runs (
+    id VARCHAR(36) NOT NULL,
+    session_id VARCHAR(36) NOT NULL,
+    buyer_item_id VARCHAR(36) NOT NULL,
+    status VARCHAR(20) NOT NULL CHECK (status IN ('pending', 'active', 'completed', 'no_sellers_available', 'aborted')),
+    started_at DATETIME,
+    ended_at DATETIME,
+    current_round INTEGER NOT NULL,
+    max_rounds INTEGER NOT NULL,
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY(session_id) REFERENCES sessions (id) ON DELETE CASCADE,
+    FOREIGN KEY(buyer_item_id) REFERENCES buyer_items (id) ON DELETE CASCADE
+);
+CREATE INDEX idx_negotiation_runs_status ON negotiation_runs (status);
+CREATE INDEX idx_negotiation_runs_session ON negotiation_runs (session_id);
+CREATE TABLE messages (
+    id VARCHAR(36) NOT NULL,
+    negotiation_run_id VARCHAR(36) NOT NULL,
+    turn_number INTEGER NOT NULL,
+    sender_type VARCHAR(10) NOT NULL CHECK (sender_type IN ('buyer', 'seller')),
+    sender_id VARCHAR(36) NOT NULL,
+    sender_name VARCHAR(100) NOT NULL,
+    message_text TEXT NOT NULL,
+    mentioned_agents TEXT,
+    timestamp DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY(negotiation_run_id) REFERENCES negotiation_runs (id) ON DELETE CASCADE
+);
+CREATE INDEX idx_messages_turn ON messages (negotiation_run_id, turn_number);
+CREATE INDEX idx_messages_negotiation ON messages (negotiation_run_id);
+CREATE TABLE negotiation_outcomes (
+    id VARCHAR(36) NOT NULL,
+    negotiation_run_id VARCHAR(36) NOT NULL,
+    decision_type VARCHAR(20) NOT NULL CHECK (decision_type IN ('deal', 'no_deal')),
+    selected_seller_id VARCHAR(36),
+    final_price_per_unit FLOAT,
+    quantity INTEGER,
+    total_cost FLOAT,
+    decision_reason TEXT,
+    timestamp DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    UNIQUE (negotiation_run_id),
+    FOREIGN KEY(negotiation_run_id) REFERENCES negotiation_runs (id) ON DELETE CASCADE,
+    FOREIGN KEY(selected_seller_id) REFERENCES sellers (id)
+);
+CREATE INDEX idx_outcomes_negotiation ON negotiation_outcomes (negotiation_run_id);
+CREATE TABLE negotiation_participants (
+    id VARCHAR(36) NOT NULL,
+    negotiation_run_id VARCHAR(36) NOT NULL,
+    seller_id VARCHAR(36) NOT NULL,
+    joined_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    CONSTRAINT uq_negotiation_participant UNIQUE (negotiation_run_id, seller_id),
+    FOREIGN KEY(negotiation_run_id) REFERENCES negotiation_runs (id) ON DELETE CASCADE,
+    FOREIGN KEY(seller_id) REFERENCES sellers (id) ON DELETE CASCADE
+);
+CREATE TABLE offers (
+    id VARCHAR(36) NOT NULL,
+    message_id VARCHAR(36) NOT NULL,
+    seller_id VARCHAR(36) NOT NULL,
+    price_per_unit FLOAT NOT NULL CHECK (price_per_unit > 0),
+    quantity INTEGER NOT NULL CHECK (quantity > 0),
+    conditions TEXT,
+    timestamp DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY(message_id) REFERENCES messages (id) ON DELETE CASCADE,
+    FOREIGN KEY(seller_id) REFERENCES sellers (id) ON DELETE CASCADE
+);
+CREATE INDEX idx_offers_message ON offers (message_id);
+CREATE INDEX idx_offers_seller ON offers (seller_id);
+"""
+
+MIGRATIONS = (migrate_guid_binary, migrate_message_mentions, migrate_outcome_total_cost)
+
+
+@pytest.fixture
+def baseline_db(monkeypatch):
+    """Replace the app database with the original schema and point the migrations at it."""
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+    db_path = Path(engine.url.database)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(BASELINE_SCHEMA)
+    conn.close()
+
+    for migration in MIGRATIONS:
+        monkeypatch.setattr(migration, "DB_PATH", db_path)
+
+    yield db_path
+
+    engine.dispose()
+    Base.metadata.drop_all(bind=engine)
+
+
+def _seed_baseline_run(db_path: Path) -> dict:
+    """Insert one session with a pending run the way the original code stored it (text IDs)."""
+    ids = {name: str(uuid.uuid4()) for name in ("session", "buyer", "seller", "buyer_item", "inventory", "run", "participant")}
+    now = "2025-01-01 12:00:00"
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "INSERT INTO sessions VALUES (?, ?, ?, 'draft', 'test-model', 0.7, 500, 'lm_studio')",
+        (ids["session"], now, now)
+    )
+    conn.execute("INSERT INTO buyers VALUES (?, ?, 'Old Buyer', ?)", (ids["buyer"], ids["session"], now))
+    conn.execute(
+        "INSERT INTO sellers VALUES (?, ?, 'Old Seller', 'customer_retention', 'very_sweet', ?)",
+        (ids["seller"], ids["session"], now)
+    )
+    conn.execute(
+        "INSERT INTO buyer_items VALUES (?, ?, 'laptop', 'Gaming Laptop', 2, 800.0, 1200.0, ?)",
+        (ids["buyer_item"], ids["buyer"], now)
+    )
+    conn.execute(
+        "INSERT INTO seller_inventory VALUES (?, ?, 'laptop', 'Gaming Laptop', 700.0, 1100.0, 900.0, 5, ?)",
+        (ids["inventory"], ids["seller"], now)
+    )
+    conn.execute(
+        "INSERT INTO negotiation_runs VALUES (?, ?, ?, 'pending', NULL, NULL, 0, 10, ?)",
+        (ids["run"], ids["session"], ids["buyer_item"], now)
+    )
+    conn.execute(
+        "INSERT INTO negotiation_participants VALUES (?, ?, ?, ?)",
+        (ids["participant"], ids["run"], ids["seller"], now)
+    )
+    conn.commit()
+    conn.close()
+    return ids
+
+
+@pytest.fixture
+def sample_request():
+    """Create a sample InitializeSessionRequest."""
+    return InitializeSessionRequest(
+        buyer=BuyerConfig(
+            name="Test Buyer",
+            shopping_list=[
+                ShoppingItem(
+                    item_id="laptop",
+                    item_name="Gaming Laptop",
+                    quantity_needed=2,
+                    min_price_per_unit=800.0,
+                    max_price_per_unit=1200.0
+                )
+            ]
+        ),
+        sellers=[
+            SellerConfig(
+                name="TechStore",
+                inventory=[
+                    InventoryItem(
+                        item_id="laptop",
+                        item_name="Gaming Laptop",
+                        cost_price=700.0,
+                        selling_price=1100.0,
+                        least_price=900.0,
+                        quantity_available=5
+                    )
+                ],
+                profile=SellerProfile(
+                    priority="customer_retention",
+                    speaking_style="very_sweet"
+                )
+            )
+        ],
+        llm_config=LLMConfig(
+            model="test-model",
+            temperature=0.7,
+            max_tokens=500
+        )
+    )
+
+
+class TestBaselineMigrations:
+    """Test that a migrated original-schema database accepts new negotiations."""
+
+    def test_guid_migration_keeps_existing_rows(self, baseline_db, sample_request):
+        """Text IDs become binary; old sessions stay readable and new ones can be written."""
+        old = _seed_baseline_run(baseline_db)
+
+        migrate_guid_binary.migrate()
+        init_db()
+
+        manager = SessionManager()
+        session = manager.get_session(old["session"])
+        assert session["buyer_name"] == "Old Buyer"
+        assert session["total_runs"] == 1
+        assert manager.start_negotiation(old["run"])["status"] == "active"
+        assert manager.get_active_room_state(old["run"]).sellers[0].seller_id == old["seller"]
+
+        response = manager.create_session(sample_request)
+        assert manager.get_session(response.session_id)["status"] == "draft"
+
+    def test_migrated_db_accepts_new_sessions(self, baseline_db, sample_request):
+        """Migrations, then app startup, then a full negotiation write path."""
+        for migration in MIGRATIONS:
+            migration.migrate()
+        init_db()
+
+        manager = SessionManager()
+        response = manager.create_session(sample_request)
+        room_id = response.negotiation_rooms[0].room_id
+        seller_id = response.seller_ids[0]
+
+        assert manager.start_negotiation(room_id)["status"] == "active"
+        message = manager.record_message(
+            run_id=room_id,
+            turn_number=1,
+            sender_type="buyer",
+            sender_id=response.buyer_id,
+            sender_name="Test Buyer",
+            message_text="Hello",
+            mentioned_agents=[seller_id]
+        )
+        manager.record_offer(message_id=message.id, seller_id=seller_id, price_per_unit=950.0, quantity=2)
+        outcome = manager.finalize_run(
+            run_id=room_id,
+            decision_type="deal",
+            selected_seller_id=seller_id,
+            final_price_per_unit=950.0,
+            quantity=2
+        )
+        manager.flush_logs()
+
+        assert outcome.total_cost == 1900.0
+        assert manager.get_session(response.session_id)["status"] == "draft"
@@ -11,7 +11,7 @@ import uuid
 from datetime import datetime, timedelta
 from app.core.database import get_db, init_db, Base, engine
 from app.core.session_manager import SessionManager
-from app.core.models import Session, NegotiationRun, Message, Offer, NegotiationOutcome
+from app.core.models import Session, NegotiationRun, NegotiationParticipant, SellerInventory, Message, Offer, NegotiationOutcome
 from app.models.api_schemas import InitializeSessionRequest, BuyerConfig, ShoppingItem, SellerConfig, InventoryItem, SellerProfile, LLMConfig
 
 
@@ -88,7 +88,23 @@ class TestSessionManager:
         assert session is not None
         assert session.llm_model == "test-model"
         assert session.status == "draft"
+        
+        # Inventory and participants are written with Core inserts
+        inventory = db_session.query(SellerInventory).filter(SellerInventory.seller_id == response.seller_ids[0]).all()
+        assert [(inv.item_id, inv.least_price) for inv in inventory] == [("laptop", 900.0)]
+        assert db_session.query(NegotiationParticipant).count() == 1
     
+    def test_create_session_keeps_first_duplicate_inventory_item(self, db_session, sample_request):
+        """Test that an item listed twice for one seller is stored once, not rejected."""
+        inventory = sample_request.sellers[0].inventory
+        inventory.append(inventory[0].model_copy(update={"quantity_available": 1}))
+
+        manager = SessionManager()
+        response = manager.create_session(sample_request)
+
+        rows = db_session.query(SellerInventory).filter(SellerInventory.seller_id == response.seller_ids[0]).all()
+        assert [(inv.item_id, inv.quantity_available) for inv in rows] == [("laptop", 5)]
+
     def test_get_session(self, db_session, sample_request):
         """Test getting session details."""
         manager = SessionManager()
@@ -130,6 +146,25 @@ class TestSessionManager:
         run = db_session.query(NegotiationRun).filter(NegotiationRun.id == room_id).first()
         assert run.status == "active"
         assert run.started_at is not None
+
+    def test_concurrent_starts_claim_room_once(self, db_session, sample_request):
+        """Of several threads starting the same room, exactly one succeeds."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        manager = SessionManager()
+        create_response = manager.create_session(sample_request)
+        room_id = create_response.negotiation_rooms[0].room_id
+
+        try:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                results = list(pool.map(lambda _: manager.start_negotiation(room_id), range(4)))
+        finally:
+            # Close the extra pooled connections the worker threads opened so
+            # later tests start from a clean pool
+            engine.dispose()
+
+        assert sum(1 for r in results if r.get("status") == "active") == 1
+        assert all("already" in r["error"] for r in results if "error" in r)
     
     def test_record_message(self, db_session, sample_request):
         """Test recording a message."""
@@ -139,6 +174,7 @@ class TestSessionManager:
         manager.start_negotiation(room_id)
         
         buyer_id = create_response.buyer_id
+        seller_id = create_response.seller_ids[0]
         
         message = manager.record_message(
             run_id=room_id,
@@ -147,7 +183,7 @@ class TestSessionManager:
             sender_id=buyer_id,
             sender_name="Test Buyer",
             message_text="Hello, I'm interested in buying laptops.",
-            mentioned_agents=["seller1"]
+            mentioned_agents=[seller_id]
         )
         
         assert message.id is not None
@@ -227,6 +263,48 @@ class TestSessionManager:
         assert run.status == "completed"
         assert run.ended_at is not None
     
+    def test_finalize_run_saves_streamed_messages(self, db_session, sample_request):
+        """Test that finalize_run writes the room's conversation history in one batch."""
+        manager = SessionManager()
+        create_response = manager.create_session(sample_request)
+        room_id = create_response.negotiation_rooms[0].room_id
+        buyer_id = create_response.buyer_id
+        seller_id = create_response.seller_ids[0]
+        manager.start_negotiation(room_id)
+
+        history = [
+            {
+                "turn_number": 1,
+                "timestamp": datetime.now(),
+                "sender_id": buyer_id,
+                "sender_type": "buyer",
+                "sender_name": "Test Buyer",
+                "content": "@TechStore what is your price?",
+                "mentioned_sellers": [seller_id, seller_id]
+            },
+            {
+                "turn_number": 1,
+                "timestamp": datetime.now(),
+                "sender_id": seller_id,
+                "sender_type": "seller",
+                "sender_name": "TechStore",
+                "content": "$950 each.",
+                "mentioned_sellers": [],
+                "offer": {"price": 950.0, "quantity": 2}
+            }
+        ]
+        manager.finalize_run(run_id=room_id, decision_type="no_deal", messages=history)
+
+        messages = (
+            db_session.query(Message)
+            .filter(Message.negotiation_run_id == room_id)
+            .order_by(Message.sender_type)
+            .all()
+        )
+        assert [m.message_text for m in messages] == ["@TechStore what is your price?", "$950 each."]
+        assert messages[0].mentioned_agents == [seller_id]
+        assert messages[1].mentioned_agents == []
+
     def test_complete_negotiation_flow(self, db_session, sample_request):
         """Test complete negotiation flow."""
         manager = SessionManager()
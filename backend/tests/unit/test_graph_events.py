@@ -0,0 +1,110 @@
+"""
+Unit tests for NegotiationGraph event emission.
+
+WHAT: Test the shape of events yielded by NegotiationGraph.run
+WHY: The SSE layer serializes events as-is and relies on ISO string timestamps
+HOW: Stub the graph nodes and inspect every emitted event
+"""
+
+import json
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.agents.graph_builder import NegotiationGraph
+from app.models.agent import BuyerConstraints, Seller, SellerProfile, InventoryItem
+from app.models.negotiation import NegotiationRoomState
+
+
+def _make_room_state() -> NegotiationRoomState:
+    seller = Seller(
+        seller_id="seller_1",
+        name="TechStore",
+        profile=SellerProfile(priority="customer_retention", speaking_style="very_sweet"),
+        inventory=[
+            InventoryItem(
+                item_id="laptop",
+                item_name="Gaming Laptop",
+                cost_price=700.0,
+                selling_price=1100.0,
+                least_price=900.0,
+                quantity_available=5
+            )
+        ]
+    )
+    return NegotiationRoomState(
+        room_id="room_1",
+        buyer_id="buyer_1",
+        buyer_name="Test Buyer",
+        buyer_constraints=BuyerConstraints(
+            item_id="laptop",
+            item_name="Gaming Laptop",
+            quantity_needed=2,
+            min_price_per_unit=800.0,
+            max_price_per_unit=1200.0
+        ),
+        sellers=[seller],
+        max_rounds=3
+    )
+
+
+def _contains_datetime(value) -> bool:
+    if isinstance(value, datetime):
+        return True
+    if isinstance(value, dict):
+        return any(_contains_datetime(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_contains_datetime(v) for v in value)
+    return False
+
+
+async def _collect_events(graph: NegotiationGraph, decision):
+    buyer_result = {"message": "Hello @TechStore", "mentioned_sellers": ["seller_1"]}
+    seller_results = {
+        "seller_1": {"message": "I can do $950", "offer": {"price": 950.0, "quantity": 2}}
+    }
+    with patch.object(graph, "_buyer_turn_node", AsyncMock(return_value=buyer_result)), \
+         patch.object(graph, "_parallel_seller_responses_node", AsyncMock(return_value=seller_results)), \
+         patch.object(graph, "_decision_check_node", AsyncMock(return_value=decision)):
+        return [event async for event in graph.run(_make_room_state())]
+
+
+@pytest.mark.phase2
+@pytest.mark.unit
+class TestGraphEventTimestamps:
+    """Every emitted event must carry a JSON-ready ISO timestamp."""
+    
+    @pytest.mark.asyncio
+    async def test_events_never_contain_datetime(self):
+        """Test no event (or nested payload) carries a datetime instance."""
+        graph = NegotiationGraph(MagicMock())
+        graph.max_rounds = 2
+        
+        events = await _collect_events(graph, decision=None)
+        
+        assert events
+        for event in events:
+            assert not _contains_datetime(event), f"datetime leaked in {event['type']} event"
+            assert isinstance(event["timestamp"], str)
+            datetime.fromisoformat(event["timestamp"])
+            json.dumps(event)
+    
+    @pytest.mark.asyncio
+    async def test_decision_events_use_iso_timestamps(self):
+        """Test decision and completion events follow the same contract."""
+        graph = NegotiationGraph(MagicMock())
+        decision = {
+            "seller_id": "seller_1",
+            "offer": {"price": 950.0, "quantity": 2},
+            "reason": "Best offer"
+        }
+        
+        events = await _collect_events(graph, decision=decision)
+        
+        types = [event["type"] for event in events]
+        assert "decision" in types
+        assert types[-1] == "negotiation_complete"
+        assert events[types.index("decision")]["data"]["chosen_seller_name"] == "TechStore"
+        for event in events:
+            assert isinstance(event["timestamp"], str)
+            assert not _contains_datetime(event)
@@ -7,14 +7,15 @@ HOW: Insert invalid data and verify IntegrityError is raised
 """
 
 import pytest
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import IntegrityError, StatementError
 from datetime import datetime
 import uuid
 
 from app.core.database import get_db, init_db, Base, engine
 from app.core.models import (
     Session, Buyer, BuyerItem, Seller, SellerInventory,
-    NegotiationRun, NegotiationParticipant, Message, Offer, NegotiationOutcome
+    NegotiationRun, NegotiationParticipant, Message, MessageMention, Offer, NegotiationOutcome,
+    is_guid
 )
 
 
@@ -409,6 +410,37 @@ class TestForeignKeyCascades:
         inv_check = db_session.query(SellerInventory).filter(SellerInventory.id == inv_id).first()
         assert inv_check is None
 
+    def test_mention_requires_existing_seller(self, db_session):
+        """Test that a mention must point at a seller row."""
+        session = Session(id=str(uuid.uuid4()), llm_model="test-model", status="draft")
+        buyer = Buyer(id=str(uuid.uuid4()), session_id=session.id, name="Test Buyer")
+        buyer_item = BuyerItem(
+            id=str(uuid.uuid4()),
+            buyer_id=buyer.id,
+            item_id="item1",
+            item_name="Test Item",
+            quantity_needed=1,
+            min_price_per_unit=10.0,
+            max_price_per_unit=20.0
+        )
+        run = NegotiationRun(id=str(uuid.uuid4()), session_id=session.id, buyer_item_id=buyer_item.id)
+        message = Message(
+            id=str(uuid.uuid4()),
+            negotiation_run_id=run.id,
+            turn_number=1,
+            sender_type="buyer",
+            sender_id=buyer.id,
+            sender_name="Test Buyer",
+            message_text="Hello"
+        )
+        for obj in (session, buyer, buyer_item, run, message):
+            db_session.add(obj)
+            db_session.flush()
+
+        db_session.add(MessageMention(message_id=message.id, seller_id=str(uuid.uuid4())))
+        with pytest.raises(IntegrityError):
+            db_session.commit()
+
 
 class TestIndexes:
     """Test that indexes exist."""
@@ -437,3 +469,35 @@ class TestIndexes:
         assert 'idx_messages_negotiation' in message_indexes
         assert 'idx_messages_turn' in message_indexes
 
+
+class TestBulkInsert:
+    """Test batched INSERT support on high-volume tables."""
+    
+    def test_high_volume_tables_declare_insert_sentinel(self):
+        """Messages and offers keep the batched INSERT..RETURNING path via an explicit sentinel."""
+        for model in (Message, Offer):
+            sentinel = model.__table__._sentinel_column_characteristics
+            assert sentinel.is_explicit
+            assert [c.name for c in sentinel.columns] == ["id"]
+
+
+class TestGUID:
+    """Test the binary UUID column type."""
+    
+    def test_round_trips_uuid_strings(self, db_session):
+        """IDs go in and come back as the same UUID strings."""
+        session_id = str(uuid.uuid4())
+        db_session.add(Session(id=session_id, llm_model="test-model", status="draft"))
+        db_session.commit()
+        
+        assert db_session.query(Session.id).filter(Session.id == session_id).scalar() == session_id
+    
+    def test_rejects_malformed_ids(self, db_session):
+        """A non-UUID ID raises instead of being stored or matched as raw bytes."""
+        with pytest.raises(StatementError) as exc_info:
+            db_session.query(Session).filter(Session.id == "not-a-uuid-value").first()
+        assert isinstance(exc_info.value.orig, ValueError)
+        
+        assert is_guid(str(uuid.uuid4()))
+        assert not is_guid("not-a-uuid-value")
+        assert not is_guid(None)
@@ -10,7 +10,7 @@ import pytest
 import uuid
 from app.core.database import get_db, init_db, Base, engine
 from app.core.models import Session, Buyer, BuyerItem, Seller, SellerInventory
-from app.services.seller_selection import select_sellers_for_item
+from app.services.seller_selection import index_inventories, select_sellers_for_item
 
 
 @pytest.fixture(scope="function")
@@ -332,4 +332,25 @@ class TestSellerSelection:
         assert len(skipped) == 2
         assert skipped[0]["reason_code"] in ["no_inventory", "insufficient_quantity"]
         assert skipped[1]["reason_code"] in ["no_inventory", "insufficient_quantity"]
-
+    
+    def test_prebuilt_index_matches_case_insensitively(self, sample_buyer_item):
+        """A shared index_inventories() result matches names like the scan did."""
+        seller = Seller(id=str(uuid.uuid4()), name="Shop", priority="maximize_profit", speaking_style="rude")
+        first = SellerInventory(
+            item_id="laptop", item_name="  gaming LAPTOP ", cost_price=700.0,
+            selling_price=1100.0, least_price=900.0, quantity_available=5
+        )
+        duplicate = SellerInventory(
+            item_id="laptop-2", item_name="Gaming Laptop", cost_price=700.0,
+            selling_price=1100.0, least_price=900.0, quantity_available=0
+        )
+        inventories = [[first, duplicate]]
+        
+        indexes = index_inventories(inventories)
+        participating, skipped = select_sellers_for_item(
+            sample_buyer_item, [seller], inventories, indexes
+        )
+        
+        assert indexes[0]["gaming laptop"] is first, "First entry should win on duplicate names"
+        assert participating == [seller]
+        assert skipped == []
@@ -177,8 +177,7 @@ class TestSummaryService:
             decision_type="deal",
             selected_seller_id=seller.id,
             final_price_per_unit=950.0,
-            quantity=2,
-            total_cost=1900.0
+            quantity=2
         )
         db_session.add(outcome1)
         
@@ -188,8 +187,7 @@ class TestSummaryService:
             decision_type="deal",
             selected_seller_id=seller.id,
             final_price_per_unit=30.0,
-            quantity=1,
-            total_cost=30.0
+            quantity=1
         )
         db_session.add(outcome2)
         db_session.commit()
@@ -262,8 +260,7 @@ class TestSummaryService:
             decision_type="deal",
             selected_seller_id=seller.id,
             final_price_per_unit=950.0,
-            quantity=2,
-            total_cost=1900.0
+            quantity=2
         )
         db_session.add(outcome)
         db_session.commit()
@@ -315,8 +312,7 @@ class TestSummaryService:
             decision_type="deal",
             selected_seller_id=seller.id,
             final_price_per_unit=950.0,
-            quantity=2,
-            total_cost=1900.0
+            quantity=2
         )
         db_session.add(outcome)
         db_session.commit()